@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+# lidar_archive.py
+# Uzun süreli kayıtlar için sıkıştırılmış arşiv formatı (.ldar).
+#
+# - Mesafeler milimetreye kuantize edilir (uint16, 0xFFFF = boşluk / NaN)
+# - Açılar milidereceye kuantize edilip blok içinde delta kodlanır (int32)
+# - Zaman damgaları (varsa) mikrosaniye delta olarak saklanır; eksik (NaN) damgalar bit maskesiyle işaretlenir
+# - Her blok bağımsız sıkıştırılır (zlib ya da lzma, standart kütüphane) => seek + paralel açma
+# - Dosya sonundaki indeks blok ofsetlerini ve zaman aralıklarını tutar
+#
+# Kullanım:
+#   python lidar_archive.py lidar_data_20251022_091026.csv out.ldar [--codec lzma]
+#   python lidar_archive.py --bench lidar_data_20251022_091026.csv
+
+import lzma
+import os
+import struct
+import sys
+import time
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from lidar_dataset import load
+
+# ---- Config ----
+BLOCK_POINTS = 65536         # bir bloktaki hedef nokta sayısı (tam devirler halinde doldurulur)
+DEFAULT_CODEC = "zlib"       # "zlib" ya da "lzma"
+ZLIB_LEVEL = 6
+LZMA_PRESET = 6
+# -----------------
+
+FILE_MAGIC = b"LDAR1\n"
+END_MAGIC = b"LDAREND1"
+BLOCK_MAGIC = b"BLK1"
+CODECS = {"zlib": 1, "lzma": 2}
+CODEC_NAMES = {v: k for k, v in CODECS.items()}
+
+FLAG_TIMESTAMP = 1
+FLAG_INTENSITY = 2
+FLAG_TS_MISSING = 4          # blokta NaN zaman damgası var: delta akışından sonra bit maskesi gelir
+
+RANGE_GAP = 0xFFFF           # NaN mesafe (kopma işareti) için ayrılmış değer
+ANGLE_SCALE = 1000.0         # derece -> miliderece
+RANGE_SCALE = 1000.0         # metre -> milimetre
+
+# magic, codec, flags, n_points, n_revs, t_first, t_last, payload_len, crc32
+_BLOCK_HDR = struct.Struct("<4sBBIIddII")
+# offset, n_points, t_first, t_last
+_INDEX_ENTRY = struct.Struct("<QIdd")
+_FOOTER = struct.Struct("<QI8s")
+
+
+def _shuffle(arr):
+    """Bayt karıştırma: aynı anlamlı baytları yan yana getirir, sıkıştırma oranını artırır."""
+    a = np.ascontiguousarray(arr)
+    return a.view(np.uint8).reshape(-1, a.itemsize).T.tobytes()
+
+
+def _unshuffle(buf, dtype, n):
+    dtype = np.dtype(dtype)
+    b = np.frombuffer(buf, dtype=np.uint8).reshape(dtype.itemsize, n).T
+    return np.ascontiguousarray(b).view(dtype).reshape(n)
+
+
+def _compress(data, codec):
+    if codec == "lzma":
+        return lzma.compress(data, preset=LZMA_PRESET)
+    return zlib.compress(data, ZLIB_LEVEL)
+
+
+def _decompress(data, codec_id):
+    if CODEC_NAMES[codec_id] == "lzma":
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+def split_revolutions(angles_deg):
+    """Açının geriye sardığı (ör. 359 -> 0) yerlerden devir uzunluklarını döner."""
+    a = np.asarray(angles_deg, dtype=np.float64)
+    if a.shape[0] == 0:
+        return np.zeros(0, dtype=np.uint32)
+    valid = np.isfinite(a)
+    if not valid.all():
+        # boşluk satırları (NaN) bir önceki açıyı taşır, sarmal sayılmaz
+        idx = np.where(valid, np.arange(a.shape[0]), 0)
+        np.maximum.accumulate(idx, out=idx)
+        a = a[idx]
+    d = np.diff(a)
+    starts = np.flatnonzero(d < -180.0) + 1
+    edges = np.concatenate(([0], starts, [a.shape[0]]))
+    return np.diff(edges).astype(np.uint32)
+
+
+def encode_block(angles_deg, ranges_m, rev_lengths, timestamps=None, intensities=None, codec=DEFAULT_CODEC):
+    """Bir bloğu (tam devirler) sıkıştırılmış bayt dizisine çevirir."""
+    angles_deg = np.asarray(angles_deg, dtype=np.float64)
+    ranges_m = np.asarray(ranges_m, dtype=np.float64)
+    n = angles_deg.shape[0]
+
+    gap = ~np.isfinite(ranges_m) | ~np.isfinite(angles_deg)
+    q_angle = np.rint(np.where(gap, 0.0, angles_deg) * ANGLE_SCALE).astype(np.int64)
+    if gap.any():
+        # boşluk satırında açı bir önceki açıyı tekrarlar (delta 0)
+        idx = np.where(gap, 0, np.arange(n))
+        np.maximum.accumulate(idx, out=idx)
+        q_angle = q_angle[idx]
+    d_angle = np.diff(q_angle, prepend=0).astype(np.int32)
+
+    q_range = np.rint(np.where(gap, 0.0, ranges_m) * RANGE_SCALE)
+    np.clip(q_range, 0, RANGE_GAP - 1, out=q_range)
+    q_range = q_range.astype(np.uint16)
+    q_range[gap] = RANGE_GAP
+
+    flags = 0
+    parts = [np.asarray(rev_lengths, dtype=np.uint32).tobytes(), _shuffle(d_angle), _shuffle(q_range)]
+    t_first = t_last = float("nan")
+    if timestamps is not None:
+        flags |= FLAG_TIMESTAMP
+        ts = np.asarray(timestamps, dtype=np.float64)
+        missing = ~np.isfinite(ts)
+        if missing.any():
+            # NaN -> int64 dönüşümü INT64_MIN üretir; eksik damgalar komşulardan enterpole edilip
+            # (küçük delta) çözümde maske ile tekrar NaN yapılır
+            flags |= FLAG_TS_MISSING
+            known = np.flatnonzero(~missing)
+            ts = np.interp(np.arange(n), known, ts[known]) if known.shape[0] else np.zeros(n)
+        q_ts = np.rint(ts * 1e6).astype(np.int64)
+        parts.append(_shuffle(np.diff(q_ts, prepend=0)))
+        if missing.any():
+            parts.append(np.packbits(missing).tobytes())
+        if not missing.all():
+            known_ts = ts[~missing]
+            t_first, t_last = float(known_ts[0]), float(known_ts[-1])
+    if intensities is not None:
+        flags |= FLAG_INTENSITY
+        # eksik şiddet (None -> NaN) 0 okumasından ayırt edilebilsin diye NaN olarak saklanır
+        parts.append(_shuffle(np.asarray(intensities, dtype=np.float32)))
+
+    payload = _compress(b"".join(parts), codec)
+    header = _BLOCK_HDR.pack(BLOCK_MAGIC, CODECS[codec], flags, n, len(rev_lengths),
+                             t_first, t_last, len(payload), zlib.crc32(payload))
+    return header + payload, t_first, t_last
+
+
+def decode_block(buf):
+    """encode_block çıktısını çözer; dict döner (angle_deg, range_m, rev_lengths, [timestamp], [intensity])."""
+    magic, codec_id, flags, n, n_revs, t_first, t_last, plen, crc = _BLOCK_HDR.unpack_from(buf, 0)
+    if magic != BLOCK_MAGIC:
+        raise ValueError("Geçersiz blok başlığı")
+    payload = bytes(buf[_BLOCK_HDR.size:_BLOCK_HDR.size + plen])
+    if zlib.crc32(payload) != crc:
+        raise ValueError("Blok CRC hatası (bozuk arşiv)")
+    raw = _decompress(payload, codec_id)
+
+    pos = 0
+    rev_lengths = np.frombuffer(raw, dtype=np.uint32, count=n_revs, offset=pos)
+    pos += 4 * n_revs
+    d_angle = _unshuffle(raw[pos:pos + 4 * n], np.int32, n)
+    pos += 4 * n
+    q_range = _unshuffle(raw[pos:pos + 2 * n], np.uint16, n)
+    pos += 2 * n
+
+    gap = q_range == RANGE_GAP
+    angle = np.cumsum(d_angle, dtype=np.int64) / ANGLE_SCALE
+    rng = q_range / RANGE_SCALE
+    if gap.any():
+        angle[gap] = np.nan
+        rng[gap] = np.nan
+    out = {"angle_deg": angle, "range_m": rng, "rev_lengths": rev_lengths}
+    if flags & FLAG_TIMESTAMP:
+        d_ts = _unshuffle(raw[pos:pos + 8 * n], np.int64, n)
+        pos += 8 * n
+        out["timestamp"] = np.cumsum(d_ts) / 1e6
+        if flags & FLAG_TS_MISSING:
+            nb = (n + 7) // 8
+            missing = np.unpackbits(np.frombuffer(raw, dtype=np.uint8, count=nb, offset=pos), count=n).astype(bool)
+            pos += nb
+            out["timestamp"][missing] = np.nan
+    if flags & FLAG_INTENSITY:
+        out["intensity"] = _unshuffle(raw[pos:pos + 4 * n], np.float32, n)
+        pos += 4 * n
+    return out
+
+
+class ArchiveWriter:
+    """
+    Devir devir yazılan noktaları bloklar halinde .ldar dosyasına kaydeder.
+
+        w = ArchiveWriter("session.ldar")
+        w.write_revolution(angles_deg, ranges_m, timestamps)
+        w.close()
+    """
+
+    def __init__(self, filename, codec=DEFAULT_CODEC, block_points=BLOCK_POINTS):
+        if codec not in CODECS:
+            raise ValueError(f"Bilinmeyen codec: {codec}")
+        self.filename = filename
+        self.codec = codec
+        self.block_points = block_points
+        self.f = open(filename, "wb")
+        self.f.write(FILE_MAGIC)
+        self.index = []
+        self._pending = []
+        self._pending_points = 0
+        self._has_ts = None
+        self._has_int = None
+
+    def write_revolution(self, angles_deg, ranges_m, timestamps=None, intensities=None):
+        # ilk devir şemayı sabitler (zaman damgası / şiddet var mı); sonraki devirler uymak zorunda
+        if self._has_ts is None:
+            self._has_ts = timestamps is not None
+            self._has_int = intensities is not None
+        if (timestamps is not None) != self._has_ts:
+            raise ValueError(f"Arşiv şeması zaman damgası {'içeriyor' if self._has_ts else 'içermiyor'}, "
+                             f"bu devirde {'yok' if timestamps is None else 'var'}")
+        if (intensities is not None) != self._has_int:
+            raise ValueError(f"Arşiv şeması şiddet {'içeriyor' if self._has_int else 'içermiyor'}, "
+                             f"bu devirde {'yok' if intensities is None else 'var'}")
+        n = len(angles_deg)
+        for name, col in (("ranges_m", ranges_m), ("timestamps", timestamps), ("intensities", intensities)):
+            if col is not None and len(col) != n:
+                raise ValueError(f"{name} uzunluğu ({len(col)}) açı sayısıyla ({n}) uyuşmuyor")
+        self._pending.append((
+            np.asarray(angles_deg, dtype=np.float64),
+            np.asarray(ranges_m, dtype=np.float64),
+            np.asarray(timestamps, dtype=np.float64) if self._has_ts else None,
+            np.asarray(intensities, dtype=np.float64) if self._has_int else None,
+        ))
+        self._pending_points += n
+        if self._pending_points >= self.block_points:
+            self.flush()
+
+    def write_points(self, angles_deg, ranges_m, timestamps=None, intensities=None):
+        """Devir sınırları bilinmeyen bir akışı açı sarmalarından bölerek yazar."""
+        angles_deg = np.asarray(angles_deg, dtype=np.float64)
+        start = 0
+        for length in split_revolutions(angles_deg):
+            sl = slice(start, start + int(length))
+            self.write_revolution(
+                angles_deg[sl], np.asarray(ranges_m)[sl],
+                None if timestamps is None else np.asarray(timestamps)[sl],
+                None if intensities is None else np.asarray(intensities)[sl])
+            start += int(length)
+
+    def flush(self):
+        if not self._pending:
+            return
+        cols = list(zip(*self._pending))
+        rev_lengths = [len(a) for a in cols[0]]
+        block, t_first, t_last = encode_block(
+            np.concatenate(cols[0]), np.concatenate(cols[1]), rev_lengths,
+            np.concatenate(cols[2]) if self._has_ts else None,
+            np.concatenate(cols[3]) if self._has_int else None,
+            codec=self.codec)
+        self.index.append((self.f.tell(), self._pending_points, t_first, t_last))
+        self.f.write(block)
+        self._pending = []
+        self._pending_points = 0
+
+    def close(self):
+        if self.f is None:
+            return
+        self.flush()
+        index_offset = self.f.tell()
+        for entry in self.index:
+            self.f.write(_INDEX_ENTRY.pack(*entry))
+        self.f.write(_FOOTER.pack(index_offset, len(self.index), END_MAGIC))
+        self.f.close()
+        self.f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class ArchiveReader:
+    """
+    .ldar dosyasını okur. İndeks sayesinde herhangi bir blok tek başına çözülebilir;
+    read_all() blokları iş parçacıklarında paralel açar (zlib/lzma GIL'i bırakır).
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{filename}: .ldar arşivi değil")
+            self.index = self._read_index(f)
+
+    @staticmethod
+    def _read_index(f):
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size >= len(FILE_MAGIC) + _FOOTER.size:
+            f.seek(size - _FOOTER.size)
+            index_offset, n_blocks, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+            if magic == END_MAGIC:
+                f.seek(index_offset)
+                raw = f.read(n_blocks * _INDEX_ENTRY.size)
+                return [_INDEX_ENTRY.unpack_from(raw, i * _INDEX_ENTRY.size) for i in range(n_blocks)]
+        # footer yok (yazım yarıda kalmış): blokları sırayla tarayarak indeksi yeniden kur
+        index = []
+        pos = len(FILE_MAGIC)
+        while pos + _BLOCK_HDR.size <= size:
+            f.seek(pos)
+            hdr = f.read(_BLOCK_HDR.size)
+            magic, _, _, n, _, t_first, t_last, plen, _ = _BLOCK_HDR.unpack(hdr)
+            if magic != BLOCK_MAGIC or pos + _BLOCK_HDR.size + plen > size:
+                break
+            index.append((pos, n, t_first, t_last))
+            pos += _BLOCK_HDR.size + plen
+        return index
+
+    def __len__(self):
+        return len(self.index)
+
+    def n_points(self):
+        return sum(entry[1] for entry in self.index)
+
+    def read_block(self, i):
+        offset = self.index[i][0]
+        with open(self.filename, "rb") as f:
+            f.seek(offset)
+            hdr = f.read(_BLOCK_HDR.size)
+            plen = _BLOCK_HDR.unpack(hdr)[7]
+            return decode_block(hdr + f.read(plen))
+
+    def block_for_time(self, t):
+        """t zamanını içeren bloğun indeksini döner (zaman damgalı arşivlerde seek için)."""
+        # damgasız bloklar (t_first NaN) bisect sırasını bozmasın diye atlanır
+        known = [i for i, entry in enumerate(self.index) if entry[2] == entry[2]]
+        if not known:
+            return 0
+        starts = [self.index[i][2] for i in known]
+        return known[max(0, bisect_right(starts, t) - 1)]
+
+    def iter_blocks(self):
+        for i in range(len(self.index)):
+            yield self.read_block(i)
+
+    def read_all(self, workers=None):
+        """Tüm blokları (varsayılan: çekirdek sayısı kadar iş parçacığıyla) çözüp birleştirir."""
+        if not self.index:
+            return {"angle_deg": np.zeros(0), "range_m": np.zeros(0), "rev_lengths": np.zeros(0, np.uint32)}
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(self.index) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                blocks = list(ex.map(self.read_block, range(len(self.index))))
+        else:
+            blocks = list(self.iter_blocks())
+        return {key: np.concatenate([b[key] for b in blocks]) for key in blocks[0]}
+
+
+# ---------- CSV dönüştürme ve benchmark ----------
+
+def read_csv_columns(filename):
+    """Kayıt CSV'sini (angle_deg, range_m, timestamp|None, intensity|None) dizilerine okur (bkz. lidar_dataset)."""
+    data = load(filename)
+    ts = data["timestamp"]
+    inten = data["intensity"]
+    return (data["angle_deg"].astype(np.float64), data["range_m"].astype(np.float64),
+            ts if np.isfinite(ts).any() else None,
+            inten.astype(np.float64) if np.isfinite(inten).any() else None)
+
+
+def csv_to_archive(csv_file, archive_file, codec=DEFAULT_CODEC):
+    angles, ranges, ts, inten = read_csv_columns(csv_file)
+    with ArchiveWriter(archive_file, codec=codec) as w:
+        w.write_points(angles, ranges, ts, inten)
+    return archive_file
+
+
+def benchmark(csv_file, repeats=5):
+    """CSV'ye göre arşiv boyutu ve açma hızını ölçer."""
+    csv_size = os.path.getsize(csv_file)
+    angles, ranges, ts, inten = read_csv_columns(csv_file)
+    n = angles.shape[0]
+    print(f"📄 {csv_file}: {n} nokta, {csv_size / 1024:.1f} KiB")
+
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        read_csv_columns(csv_file)
+    csv_rate = n * repeats / (time.perf_counter() - t0)
+    print(f"   CSV okuma (numpy): {csv_rate / 1e6:.2f} M nokta/s")
+
+    for codec in CODECS:
+        out = f"{csv_file}.{codec}.ldar"
+        t0 = time.perf_counter()
+        with ArchiveWriter(out, codec=codec) as w:
+            w.write_points(angles, ranges, ts, inten)
+        enc = time.perf_counter() - t0
+        size = os.path.getsize(out)
+        reader = ArchiveReader(out)
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            reader.read_all(workers=1)
+        dec = (time.perf_counter() - t0) / repeats
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            reader.read_all()
+        dec_par = (time.perf_counter() - t0) / repeats
+        print(f"   {codec:5s}: {size / 1024:8.1f} KiB  oran {csv_size / size:5.1f}x  "
+              f"yazma {n / enc / 1e6:.2f} M/s  açma {n / dec / 1e6:.2f} M/s "
+              f"(paralel {n / dec_par / 1e6:.2f} M/s, {len(reader)} blok)")
+        os.remove(out)
+
+
+def main(argv):
+    if len(argv) >= 2 and argv[0] == "--bench":
+        benchmark(argv[1])
+        return 0
+    if len(argv) < 2:
+        print("Kullanım: python lidar_archive.py input.csv out.ldar [--codec zlib|lzma]")
+        return 1
+    codec = argv[argv.index("--codec") + 1] if "--codec" in argv else DEFAULT_CODEC
+    out = csv_to_archive(argv[0], argv[1], codec=codec)
+    print(f"💾 Arşiv kaydedildi: {out} ({os.path.getsize(argv[0]) / 1024:.1f} KiB -> {os.path.getsize(out) / 1024:.1f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# lidar_batch_stats.py
+# Bir klasördeki tüm lidar_data_*.csv / lidar_live_*.csv kayıtları için oturum istatistikleri.
+# Her dosya ayrı bir iş olarak süreç havuzunda işlenir (çekirdek sayısıyla ölçeklenir),
+# sonuçlar tek bir özet tabloya (CSV) yazılır.
+#
+# Kullanım:
+#   python lidar_batch_stats.py ./kayitlar -o lidar_summary.csv -j 4
+
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lidar_dataset import detect_layout, load
+
+# ---- Config ----
+FILE_PATTERNS = ("lidar_data_*.csv", "lidar_live_*.csv")
+RANGE_BIN_EDGES = (0.0, 0.25, 0.5, 1.0, 2.0, 3.0, 4.0, 6.0, 8.0, 12.0, float("inf"))
+SECTOR_COUNT = 36            # kapsama için 10° sektörler
+SUMMARY_FILE = "lidar_summary.csv"
+# -----------------
+
+
+def session_stats(filename):
+    """
+    Tek bir kayıt dosyası için istatistik satırı (dict). Süreç havuzunda çalışır.
+    Hata istisna olarak yükseltilmez, satırın "error" sütununa yazılır: tek bozuk dosya toplu işi durdurmaz.
+    """
+    t0 = time.perf_counter()
+    row = {"file": os.path.basename(filename)}
+    try:
+        layout = detect_layout(filename)
+    except ValueError as e:
+        row["layout"] = f"unknown: {e}"
+        return row
+    except OSError as e:                  # klasör, okuma izni yok, ...
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+    try:
+        _fill_stats(row, filename, layout)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["analysis_s"] = round(time.perf_counter() - t0, 4)
+    return row
+
+
+def _fill_stats(row, filename, layout):
+    data = load(filename, layout)
+    row["layout"] = layout.name
+    row["skipped_rows"] = layout.skipped_rows
+    angles = data["angle_deg"].astype(np.float64)
+    dists = data["range_m"].astype(np.float64)
+    ts = data["timestamp"] if layout.time_kind else None
+    finite = np.isfinite(angles) & np.isfinite(dists)      # NaN satırları = kopma işaretleri
+    angles, dists = angles[finite], dists[finite]
+    valid = dists > 0
+    n = int(angles.shape[0])
+    n_valid = int(valid.sum())
+
+    row["points"] = n
+    row["valid_points"] = n_valid
+    row["gap_markers"] = int((~finite).sum())
+    row["zero_ratio"] = round(1.0 - n_valid / n, 4) if n else float("nan")
+    if n_valid:
+        v = dists[valid]
+        row["range_min_m"] = round(float(v.min()), 3)
+        row["range_median_m"] = round(float(np.median(v)), 3)
+        row["range_max_m"] = round(float(v.max()), 3)
+    hist, _ = np.histogram(dists[valid], bins=RANGE_BIN_EDGES)
+    for lo, hi, c in zip(RANGE_BIN_EDGES[:-1], RANGE_BIN_EDGES[1:], hist):
+        row[f"hist_{lo:g}_{hi:g}m"] = int(c)
+
+    sectors = (np.floor((angles[valid] % 360.0) / (360.0 / SECTOR_COUNT))).astype(np.int64)
+    covered = np.unique(np.minimum(sectors, SECTOR_COUNT - 1))
+    row["sector_coverage"] = round(covered.shape[0] / SECTOR_COUNT, 3)
+
+    revolutions = int((np.diff(angles) < -180.0).sum()) + (1 if n else 0)
+    row["revolutions"] = revolutions
+    if ts is not None:
+        ts = ts[finite]
+        ts = ts[np.isfinite(ts)]
+        if ts.shape[0] > 1:
+            duration = float(ts.max() - ts.min())
+            row["duration_s"] = round(duration, 3)
+            row["scan_rate_hz"] = round((revolutions - 1) / duration, 3) if duration > 0 else float("nan")
+
+
+def find_recordings(directory):
+    files = set()
+    for pattern in FILE_PATTERNS:
+        files.update(glob.glob(os.path.join(directory, "**", pattern), recursive=True))
+    return sorted(files)
+
+
+def write_summary(rows, filename):
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lidar kayıtları için toplu oturum istatistikleri")
+    parser.add_argument("directory", nargs="?", default=".")
+    parser.add_argument("-o", "--output", default=SUMMARY_FILE)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    files = find_recordings(args.directory)
+    if not files:
+        print(f"❌ {args.directory} altında kayıt bulunamadı.")
+        return 1
+    print(f"🔍 {len(files)} kayıt bulundu, {args.jobs} süreç ile işleniyor...")
+
+    t0 = time.perf_counter()
+    if args.jobs > 1 and len(files) > 1:
+        # dosya başına bir iş: büyük ve küçük dosyalar havuzda dengelenir
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            rows = list(ex.map(session_stats, files, chunksize=1))
+    else:
+        rows = [session_stats(f) for f in files]
+    write_summary(rows, args.output)
+    for row in rows:
+        if "error" in row:
+            print(f"⚠️ {row['file']}: {row['error']}")
+    print(f"💾 Özet kaydedildi: {args.output} ({len(rows)} oturum, {time.perf_counter() - t0:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
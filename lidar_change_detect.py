@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# lidar_change_detect.py
+# Devirden devire değişim algılama (izinsiz giriş izleme için).
+# Açı bölmesi başına arka plan mesafe modeli (EMA ortalama + EMA varyans) öğrenilir,
+# her yeni devir tek vektörel geçişle modele karşı karşılaştırılır. Geçmiş saklanmaz.
+
+import math
+
+import numpy as np
+
+# ---- Config ----
+CD_BINS = 720                # açı bölmesi sayısı (0.5°)
+CD_ALPHA = 0.05              # arka plan öğrenme hızı (EMA)
+CD_ALPHA_FOREGROUND = 0.002  # değişmiş bölmelerde daha yavaş öğren (yerinde duran nesne hemen emilmesin)
+CD_SIGMA_K = 3.0             # eşik: k * standart sapma
+CD_MIN_DELTA = 0.15          # eşik alt sınırı (m), gürültülü ama sabit bölmeler için
+CD_WARMUP = 10               # bir bölme bu kadar gözlemden önce karar vermez
+CD_MIN_SECTOR_BINS = 2       # bundan kısa değişmiş bölme grupları yok sayılır
+# -----------------
+
+
+class BackgroundChangeDetector:
+    """
+    Kullanım:
+        det = BackgroundChangeDetector()
+        result = det.update(angles_rad, ranges_m)
+        result["sectors"]      -> [(başlangıç_derece, bitiş_derece, en_yakın_m), ...]
+        result["new_points"]   -> arka plandan belirgin şekilde yakın noktaların indeksleri
+        result["changed_bins"] -> değişmiş bölmelerin boolean maskesi
+    """
+
+    def __init__(self, n_bins=CD_BINS, alpha=CD_ALPHA, alpha_foreground=CD_ALPHA_FOREGROUND,
+                 sigma_k=CD_SIGMA_K, min_delta=CD_MIN_DELTA, warmup=CD_WARMUP):
+        self.n_bins = n_bins
+        self.alpha = alpha
+        self.alpha_foreground = alpha_foreground
+        self.sigma_k = sigma_k
+        self.min_delta = min_delta
+        self.warmup = warmup
+        self.mean = np.zeros(n_bins)
+        self.var = np.zeros(n_bins)
+        self.count = np.zeros(n_bins, dtype=np.int64)
+        self._bin_scale = n_bins / (2 * math.pi)
+
+    def bin_index(self, angles_rad):
+        b = np.floor((np.asarray(angles_rad, dtype=np.float64) % (2 * math.pi)) * self._bin_scale).astype(np.int64)
+        np.minimum(b, self.n_bins - 1, out=b)
+        return b
+
+    def threshold(self):
+        return np.maximum(self.sigma_k * np.sqrt(self.var), self.min_delta)
+
+    def update(self, angles_rad, ranges_m):
+        ranges = np.asarray(ranges_m, dtype=np.float64)
+        valid = np.isfinite(ranges) & (ranges > 0)
+        bins = self.bin_index(angles_rad)
+
+        # bölme başına en yakın dönüş (sıfır/geçersiz noktalar hariç)
+        obs = np.full(self.n_bins, np.inf)
+        np.minimum.at(obs, bins[valid], ranges[valid])
+        seen = np.isfinite(obs)
+
+        thr = self.threshold()
+        ready = seen & (self.count >= self.warmup)
+        diff = np.where(seen, obs - self.mean, 0.0)
+        changed = ready & (np.abs(diff) > thr)
+
+        # arka plandan belirgin şekilde yakın noktalar = yeni nesne adayları
+        pt_thr = (self.mean - thr)[bins]
+        new_points = np.flatnonzero(valid & (self.count[bins] >= self.warmup) & (ranges < pt_thr))
+
+        # modeli artımlı güncelle (EMA ortalama ve varyans)
+        alpha = np.where(changed, self.alpha_foreground, self.alpha)
+        first = seen & (self.count == 0)
+        upd = seen & ~first
+        a = alpha[upd]
+        d = diff[upd]
+        self.mean[upd] += a * d
+        self.var[upd] = (1.0 - a) * (self.var[upd] + a * d * d)
+        self.mean[first] = obs[first]
+        self.count[seen] += 1
+
+        return {
+            "changed_bins": changed,
+            "sectors": self._sectors(changed, obs),
+            "new_points": new_points,
+        }
+
+    def _sectors(self, changed, obs):
+        """Ardışık değişmiş bölmeleri (başlangıç°, bitiş°, en yakın m) sektörlerine toplar."""
+        if not changed.any():
+            return []
+        c = changed.astype(np.int8)
+        edges = np.diff(np.concatenate(([0], c, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        # 360° -> 0° sınırından geçen sektörü birleştir
+        if len(starts) > 1 and starts[0] == 0 and ends[-1] == self.n_bins:
+            starts = np.concatenate((starts[1:-1], [starts[-1]]))
+            ends = np.concatenate((ends[1:-1], [ends[0] + self.n_bins]))
+        width = 360.0 / self.n_bins
+        out = []
+        for s, e in zip(starts, ends):
+            if e - s < CD_MIN_SECTOR_BINS:
+                continue
+            idx = np.arange(s, e) % self.n_bins
+            out.append((float(s * width % 360.0), float(e * width % 360.0), float(obs[idx].min())))
+        return out
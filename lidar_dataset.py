@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# lidar_dataset.py
+# Eski CSV düzenlerinin hepsini tek tip, tipli bir veri kümesine çeviren yükleyici.
+#
+# Scriptlerin yazdığı düzenler:
+#   angle,distance                               lidar_auto_full_scan_csv (açı radyan)
+#   angle_deg,distance_m                         lidar_live_map_csv_final
+#   timestamp,angle_deg,distance,intensity       lidar_live_radar (NaN satırı = kopma işareti)
+#   angle,distance,intensity,timestamp           lidar_auto_port_map_csv
+#   timestamp(HH:MM:SS.fff),angle_deg,distance_m lidar_live_map_csv
+#   (başlıksız) angle,range,intensity            lidar_live_map_csv_fixed
+#
+# Düzen başlıktan, birimler (radyan/derece, m/mm) değer aralığından bulunur. Ayrıştırma
+# satır satır csv.reader ile değil, blok blok NumPy ile yapılır; büyük dosyalar sabit bellekle akıtılır.
+#
+#   data = load("lidar_data_20251022_091026.csv")      # SCAN_DTYPE yapılı dizi
+#   for chunk in iter_chunks(path): ...                  # büyük dosyalar için
+
+import io
+import math
+import os
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+
+# ---- Config ----
+CHUNK_BYTES = 4 * 1024 * 1024    # akış blok boyu (~100k satır)
+# -----------------
+
+# kanonik kayıt: eksik alanlar NaN
+SCAN_DTYPE = np.dtype([
+    ("timestamp", np.float64),   # epoch saniye (ya da tarih bilinmiyorsa gün içi saniye)
+    ("angle_deg", np.float32),
+    ("range_m", np.float32),
+    ("intensity", np.float32),
+])
+
+# başlık -> sütun rolleri (timestamp / angle / range / intensity)
+HEADER_LAYOUTS = {
+    ("angle", "distance"): ("angle", "range"),
+    ("angle_deg", "distance_m"): ("angle", "range"),
+    ("timestamp", "angle_deg", "distance", "intensity"): ("timestamp", "angle", "range", "intensity"),
+    ("angle", "distance", "intensity", "timestamp"): ("angle", "range", "intensity", "timestamp"),
+    ("timestamp", "angle_deg", "distance_m"): ("timestamp", "angle", "range"),
+}
+# başlıksız dosyalar: sütun sayısı -> roller
+HEADERLESS_LAYOUTS = {
+    3: ("angle", "range", "intensity"),
+}
+
+_HMS_RE = re.compile(r"^\s*\d{1,2}:\d{2}:\d{2}(\.\d+)?\s*$")
+_FILE_DATE_RE = re.compile(r"(\d{8})_(\d{6})")
+
+
+class Layout:
+    """Bir dosyanın algılanmış düzeni ve birimleri."""
+
+    def __init__(self, header, roles, has_header, time_kind=None):
+        self.header = header
+        self.roles = roles
+        self.has_header = has_header
+        self.time_kind = time_kind       # None / "epoch" / "hms"
+        self.angle_unit = None           # "rad" / "deg" (ilk bloktan)
+        self.range_unit = None           # "m" / "mm" (ilk bloktan)
+        self.skipped_rows = 0            # eksik alanlı / bozuk atlanan satırlar (ör. yarım kalmış son satır)
+
+    @property
+    def name(self):
+        cols = ",".join(self.header) if self.has_header else "<başlıksız>"
+        return f"{cols} [{self.angle_unit or '?'}, {self.range_unit or '?'}, zaman: {self.time_kind or '-'}]"
+
+    def __repr__(self):
+        return f"Layout({self.name})"
+
+
+def _is_number(s):
+    try:
+        float(s)
+        return True
+    except ValueError:
+        return False
+
+
+def detect_layout(filename):
+    """İlk iki satırdan düzeni bulur. Bilinmeyen düzende ValueError."""
+    with open(filename, newline="") as f:
+        first = f.readline().strip()
+        second = f.readline().strip()
+    if not first:
+        raise ValueError(f"{filename}: boş dosya")
+    cells = [c.strip() for c in first.split(",")]
+
+    if all(_is_number(c) or c == "" for c in cells):
+        roles = HEADERLESS_LAYOUTS.get(len(cells))
+        if roles is None:
+            raise ValueError(f"{filename}: başlıksız {len(cells)} sütunlu düzen tanınmıyor")
+        return Layout(tuple(f"col{i}" for i in range(len(cells))), roles, has_header=False)
+
+    header = tuple(cells)
+    roles = HEADER_LAYOUTS.get(header)
+    if roles is None:
+        raise ValueError(f"{filename}: bilinmeyen başlık {first!r}")
+    time_kind = None
+    if "timestamp" in roles:
+        sample = second.split(",")[roles.index("timestamp")] if second else ""
+        time_kind = "hms" if _HMS_RE.match(sample) else "epoch"
+    return Layout(header, roles, has_header=True, time_kind=time_kind)
+
+
+def _file_midnight(filename):
+    """Dosya adındaki YYYYmmdd tarihinin yerel gece yarısı epoch'u (HH:MM:SS damgaları için)."""
+    m = _FILE_DATE_RE.search(os.path.basename(filename))
+    if not m:
+        return 0.0
+    try:
+        return time.mktime(datetime.strptime(m.group(1), "%Y%m%d").timetuple())
+    except ValueError:
+        return 0.0
+
+
+def _read_blocks(f, chunk_bytes):
+    """Satır sınırında biten metin blokları üretir."""
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            return
+        if not block.endswith("\n"):
+            block += f.readline()
+        yield block
+
+
+def _parse_block(text, n_cols):
+    """Bir metin bloğunu tek seferde float dizisine çevirir (boş alanlar -> nan). (dizi, atlanan satır) döner."""
+    # boş alanlar (ör. intensity=None) csv'de ",," ya da satır sonunda "," olarak yazılmış
+    if ",," in text or ",\n" in text or ",\r\n" in text or text.rstrip("\r\n").endswith(","):
+        text = re.sub(r"(?<=,)(?=,|\r?\n|$)", "nan", text)
+        text = re.sub(r"^(?=,)", "nan", text, flags=re.M)
+    try:
+        return np.loadtxt(io.StringIO(text), delimiter=",", dtype=np.float64, ndmin=2,
+                          usecols=range(n_cols), comments=None), 0
+    except ValueError:
+        return _parse_lines(text, n_cols)
+
+
+def _parse_lines(text, n_cols):
+    """Yavaş yol: satır satır ayrıştırır, eksik alanlı / sayısal olmayan satırları atlar."""
+    rows = []
+    skipped = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        fields = line.split(",")
+        try:
+            if len(fields) < n_cols:
+                raise ValueError
+            rows.append([float(v) for v in fields[:n_cols]])
+        except ValueError:
+            skipped += 1
+    if not rows:
+        return np.zeros((0, n_cols)), skipped
+    return np.asarray(rows, dtype=np.float64), skipped
+
+
+def _detect_units(layout, angles, ranges):
+    a = angles[np.isfinite(angles)]
+    r = ranges[np.isfinite(ranges) & (ranges > 0)]
+    layout.angle_unit = "rad" if a.size == 0 or np.abs(a).max() <= 2 * math.pi + 1e-3 else "deg"
+    # lidar menzili <= ~16 m; mm ile yazılmış mesafeler yüzlerce/binlerce olur
+    layout.range_unit = "mm" if r.size and np.percentile(r, 95) > 100.0 else "m"
+
+
+def iter_chunks(filename, layout=None, chunk_bytes=CHUNK_BYTES):
+    """Dosyayı SCAN_DTYPE blokları halinde akıtır; bellek kullanımı blok boyuyla sınırlıdır."""
+    layout = layout or detect_layout(filename)
+    roles = layout.roles
+    hms = layout.time_kind == "hms"
+    # HH:MM:SS.fff sütunu ':' -> ',' ile üç sayısal sütuna açılır
+    n_cols = len(roles) + (2 if hms else 0)
+    col = {}
+    pos = 0
+    for role in roles:
+        col[role] = pos
+        pos += 3 if (hms and role == "timestamp") else 1
+
+    midnight = _file_midnight(filename) if hms else 0.0
+    day_offset = 0.0
+    last_sod = None
+
+    with open(filename, newline="") as f:
+        if layout.has_header:
+            f.readline()
+        for block in _read_blocks(f, chunk_bytes):
+            if hms:
+                block = block.replace(":", ",")
+            # kaydedici çökünce son satır yarım kalabilir: bozuk satırlar dosyayı değil sadece kendilerini düşürür
+            raw, skipped = _parse_block(block, n_cols)
+            layout.skipped_rows += skipped
+            if raw.shape[0] == 0:
+                continue
+            out = np.empty(raw.shape[0], dtype=SCAN_DTYPE)
+
+            angles = raw[:, col["angle"]]
+            ranges = raw[:, col["range"]]
+            if layout.angle_unit is None:
+                _detect_units(layout, angles, ranges)
+            out["angle_deg"] = np.degrees(angles) if layout.angle_unit == "rad" else angles
+            out["range_m"] = ranges / 1000.0 if layout.range_unit == "mm" else ranges
+            out["intensity"] = raw[:, col["intensity"]] if "intensity" in col else np.nan
+
+            if "timestamp" not in col:
+                out["timestamp"] = np.nan
+            elif hms:
+                c = col["timestamp"]
+                sod = raw[:, c] * 3600.0 + raw[:, c + 1] * 60.0 + raw[:, c + 2]
+                # gece yarısı sarmalları (blok sınırları dahil)
+                prev = np.concatenate(([sod[0] if last_sod is None else last_sod], sod[:-1]))
+                wraps = np.cumsum(sod - prev < -43200.0)
+                out["timestamp"] = midnight + day_offset + wraps * 86400.0 + sod
+                day_offset += wraps[-1] * 86400.0
+                last_sod = sod[-1]
+            else:
+                out["timestamp"] = raw[:, col["timestamp"]]
+            yield out
+
+
+def load(filename, layout=None, chunk_bytes=CHUNK_BYTES):
+    """Tüm dosyayı tek SCAN_DTYPE dizisi olarak yükler."""
+    chunks = list(iter_chunks(filename, layout, chunk_bytes))
+    if not chunks:
+        return np.zeros(0, dtype=SCAN_DTYPE)
+    return np.concatenate(chunks)
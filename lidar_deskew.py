@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# lidar_deskew.py
+# Hareketli platformlarda devir içi bozulmanın (skew) giderilmesi.
+# Bir devir SCAN_FREQUENCY = 10 Hz'de ~100 ms sürer; bu sürede platform hareket ederse düz duvarlar eğri çıkar.
+#  1) Nokta başına zaman damgası: devir başlangıç/bitiş zamanından açı ilerlemesine göre enterpolasyon
+#  2) De-skew: verilen hız (vx, vy, ω) ya da odometri pozlarıyla her noktayı ortak referans zamanına taşır
+# Tüm işlemler devir başına toplu (vektörel). Canlı yol: lidar_live_radar, tekrar oynatma: bu dosyanın CLI'ı.
+#
+# Kullanım (replay):
+#   python lidar_deskew.py lidar_live_20251022_091026.csv out.csv --velocity 0.5 0 0.2
+#   çıktı: timestamp,angle_deg,distance,intensity (kopma işaretleri korunur, sıfır dönüşler ham açısında kalır)
+
+import math
+import sys
+import time
+
+import numpy as np
+
+# ---- Config ----
+DEFAULT_SCAN_FREQUENCY = 10.0
+# -----------------
+
+
+def scan_time_window(scan, t_prev_end, t_now, scan_frequency=DEFAULT_SCAN_FREQUENCY):
+    """
+    Bir devrin (başlangıç, bitiş) zamanı (time.time() saniyesi).
+    SDK LaserScan 'stamp' (ns) ve config.scan_time verirse onlar kullanılır; yoksa
+    önceki devrin bitişi ile bu devrin gelişi arası kabul edilir.
+    """
+    stamp = getattr(scan, "stamp", 0) or 0
+    cfg = getattr(scan, "config", None)
+    scan_time = getattr(cfg, "scan_time", 0.0) if cfg is not None else 0.0
+    if stamp > 0 and scan_time and scan_time > 0:
+        t0 = stamp / 1e9
+        return t0, t0 + scan_time
+    period = 1.0 / scan_frequency
+    if t_prev_end is None or t_now - t_prev_end > 2.5 * period:
+        return t_now - period, t_now
+    return t_prev_end, t_now
+
+
+def interpolate_timestamps(angles_rad, t_start, t_end):
+    """
+    Noktaların ölçüm zamanlarını, açının devir içindeki ilerlemesiyle orantılı olarak
+    [t_start, t_end] aralığına yayar. Açı ilerlemesi kullanılamıyorsa indeks kullanılır.
+    """
+    a = np.asarray(angles_rad, dtype=np.float64)
+    n = a.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    if n == 1:
+        return np.array([t_end])
+    progress = np.unwrap(a)
+    span = progress[-1] - progress[0]
+    if span <= 0 or not np.isfinite(span):
+        frac = np.arange(n) / (n - 1)
+    else:
+        frac = np.clip((progress - progress[0]) / span, 0.0, 1.0)
+    return t_start + frac * (t_end - t_start)
+
+
+def _se2_exp(vx, vy, omega, dt):
+    """Sabit gövde hızıyla (vx, vy, ω) dt süresinde yapılan hareket: (dx, dy, dθ) dizileri."""
+    th = omega * dt
+    small = np.abs(th) < 1e-9
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(small, 1.0 - th * th / 6.0, np.sin(th) / th)
+        c = np.where(small, th / 2.0, (1.0 - np.cos(th)) / th)
+    dx = (s * vx - c * vy) * dt
+    dy = (c * vx + s * vy) * dt
+    return dx, dy, th
+
+
+def _transform(x, y, dx, dy, dth):
+    ct, st = np.cos(dth), np.sin(dth)
+    return ct * x - st * y + dx, st * x + ct * y + dy
+
+
+def deskew_velocity(angles_rad, ranges_m, timestamps, velocity, t_ref=None):
+    """
+    Sabit hızla (vx, vy [m/s], ω [rad/s], sensör gövde çerçevesinde) hareket eden sensör için
+    her noktayı t_ref anındaki sensör çerçevesine taşır. (x, y) dizileri döner.
+    """
+    a = np.asarray(angles_rad, dtype=np.float64)
+    r = np.asarray(ranges_m, dtype=np.float64)
+    ts = np.asarray(timestamps, dtype=np.float64)
+    t_ref = ts[-1] if t_ref is None and ts.shape[0] else t_ref
+    x = r * np.cos(a)
+    y = r * np.sin(a)
+    vx, vy, omega = velocity
+    # t_i anındaki poz, t_ref pozuna göre: exp((t_i - t_ref) * twist)
+    dx, dy, dth = _se2_exp(vx, vy, omega, ts - t_ref)
+    return _transform(x, y, dx, dy, dth)
+
+
+def deskew_odometry(angles_rad, ranges_m, timestamps, odom, t_ref=None):
+    """
+    odom: (M, 4) dizisi [t, x, y, yaw] (dünya çerçevesi, zamana göre sıralı).
+    Pozlar nokta zamanlarına enterpole edilir, noktalar t_ref pozunun çerçevesine taşınır.
+    """
+    odom = np.asarray(odom, dtype=np.float64)
+    a = np.asarray(angles_rad, dtype=np.float64)
+    r = np.asarray(ranges_m, dtype=np.float64)
+    ts = np.asarray(timestamps, dtype=np.float64)
+    t_ref = ts[-1] if t_ref is None and ts.shape[0] else t_ref
+    yaw = np.unwrap(odom[:, 3])
+
+    px = np.interp(ts, odom[:, 0], odom[:, 1])
+    py = np.interp(ts, odom[:, 0], odom[:, 2])
+    pth = np.interp(ts, odom[:, 0], yaw)
+    rx = np.interp(t_ref, odom[:, 0], odom[:, 1])
+    ry = np.interp(t_ref, odom[:, 0], odom[:, 2])
+    rth = np.interp(t_ref, odom[:, 0], yaw)
+
+    # nokta -> dünya (t_i pozu) -> referans çerçevesi (t_ref pozunun tersi)
+    wx, wy = _transform(r * np.cos(a), r * np.sin(a), px, py, pth)
+    c, s = math.cos(-rth), math.sin(-rth)
+    ox, oy = wx - rx, wy - ry
+    return c * ox - s * oy, s * ox + c * oy
+
+
+def to_polar(x, y):
+    return np.arctan2(y, x), np.hypot(x, y)
+
+
+# ---------- tekrar oynatma (replay) ----------
+
+def restamp_revolutions(angles_rad, timestamps, rev_lengths):
+    """
+    Yazma anında damgalanmış kayıtlar için nokta zamanlarını yeniden üretir:
+    her devir kendi ilk damgası ile bir sonraki devrin ilk damgası arasına yayılır.
+    Sonraki devir ~2.5 periyottan geç başlıyorsa (kopma) canlı yoldaki scan_time_window gibi
+    devir bir periyotla sınırlanır; yoksa boşluk süresince yayılıp hatalı de-skew edilirdi.
+    """
+    ts = np.asarray(timestamps, dtype=np.float64)
+    starts = np.concatenate(([0], np.cumsum(rev_lengths)[:-1])).astype(np.int64)
+    t0 = ts[starts]
+    period = float(np.median(np.diff(t0))) if t0.shape[0] > 1 else 1.0 / DEFAULT_SCAN_FREQUENCY
+    t1 = np.concatenate((t0[1:], [t0[-1] + period]))
+    gap = t1 - t0 > 2.5 * period
+    t1[gap] = t0[gap] + period
+    out = np.empty_like(ts)
+    for s, n, a0, a1 in zip(starts, rev_lengths, t0, t1):
+        sl = slice(s, s + int(n))
+        out[sl] = interpolate_timestamps(angles_rad[sl], a0, a1)
+    return out
+
+
+def _split_at(rev_lengths, positions):
+    """Devir uzunluklarını verilen nokta indekslerinden de böler (boş devirler atılır)."""
+    ends = np.cumsum(rev_lengths, dtype=np.int64)
+    n = int(ends[-1]) if ends.shape[0] else 0
+    edges = np.unique(np.concatenate(([0], ends, np.clip(positions, 0, n)))).astype(np.int64)
+    return np.diff(edges).astype(np.uint32)
+
+
+def replay(csv_in, csv_out, velocity):
+    from lidar_archive import split_revolutions
+    from lidar_dataset import load
+
+    data = load(csv_in)
+    if not np.isfinite(data["timestamp"]).any():
+        print("❌ Kayıtta zaman damgası yok, de-skew yapılamaz.")
+        return 1
+    # kopma işaretleri (NaN satırları) ayrılır, çıktıda aynı yerlerine geri konur
+    marker = ~(np.isfinite(data["angle_deg"]) & np.isfinite(data["range_m"]))
+    gap_rows = np.flatnonzero(marker)
+    gap_times = data["timestamp"][marker]
+    data = data[~marker]
+    angles_deg = data["angle_deg"].astype(np.float64)
+    ranges = data["range_m"].astype(np.float64)
+    ts = data["timestamp"]
+    # kopma, açı sarmasa bile devri böler
+    gap_pos = gap_rows - np.arange(gap_rows.shape[0])
+    rev_lengths = _split_at(split_revolutions(angles_deg), gap_pos)
+    a = np.radians(angles_deg)
+    t_pts = restamp_revolutions(a, ts, rev_lengths)
+
+    t_start = time.perf_counter()
+    xs, ys = np.empty_like(a), np.empty_like(a)
+    start = 0
+    for n in rev_lengths:
+        sl = slice(start, start + int(n))
+        xs[sl], ys[sl] = deskew_velocity(a[sl], ranges[sl], t_pts[sl], velocity)
+        start += int(n)
+    elapsed = time.perf_counter() - t_start
+
+    out_a, out_r = to_polar(xs, ys)
+    # sıfır dönüşlerin konumu yok: taşınırlarsa açıları poz ötelemesinin açısı olur, ham açı korunur
+    zero = ranges <= 0
+    out_a[zero] = a[zero]
+    out_r[zero] = 0.0
+    rows = np.c_[t_pts, np.degrees(out_a), out_r, data["intensity"].astype(np.float64)]
+    if gap_rows.shape[0]:
+        rows = np.insert(rows, gap_pos, np.c_[gap_times, np.full((gap_rows.shape[0], 3), np.nan)], axis=0)
+    with open(csv_out, "w") as f:
+        # lidar_live_radar düzeni; şiddet (varsa) olduğu gibi taşınır
+        f.write("timestamp,angle_deg,distance,intensity\n")
+        np.savetxt(f, rows, delimiter=",", fmt="%.6f")
+    print(f"💾 De-skew edilmiş kayıt: {csv_out} ({len(rev_lengths)} devir, {gap_rows.shape[0]} kopma, "
+          f"{elapsed * 1000:.1f} ms)")
+    return 0
+
+
+def main(argv):
+    if len(argv) < 2:
+        print("Kullanım: python lidar_deskew.py input.csv out.csv --velocity VX VY OMEGA")
+        print("  çıktı: timestamp,angle_deg,distance,intensity")
+        return 1
+    velocity = (0.0, 0.0, 0.0)
+    if "--velocity" in argv:
+        i = argv.index("--velocity")
+        velocity = tuple(float(v) for v in argv[i + 1:i + 4])
+    return replay(argv[0], argv[1], velocity)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -6,10 +6,13 @@ import numpy as np
 import time
 import signal
 import sys
+from lidar_polar_view import PolarHistogramView
 from ydlidar import CYdLidar, LidarPropSerialPort, LidarPropSerialBaudrate, \
     LidarPropLidarType, LidarPropDeviceType, LidarPropScanFrequency, LidarPropSampleRate, \
     LidarPropSingleChannel, TYPE_TRIANGLE, YDLIDAR_TYPE_SERIAL
 
+VIEW_MODE = "scatter"  # "scatter" ya da "histogram" (sabit maliyetli polar çizgi)
+
 stop_flag = False
 
 def signal_handler(sig, frame):
@@ -45,6 +48,9 @@ def init_plot():
     fig = plt.figure(figsize=(6,6))
     ax = fig.add_subplot(111, polar=True)
     ax.set_ylim(0, 6)
+    if VIEW_MODE == "histogram":
+        # tek çizgi, sektör başına en yakın mesafe - nokta sayısından bağımsız çizim maliyeti
+        return fig, ax, PolarHistogramView(ax, color='green')
     scatter = ax.scatter([], [], s=5, c='green')
     return fig, ax, scatter
 
@@ -57,7 +63,10 @@ def update_plot(ax, scatter, scan):
         if point.range > 0.05:  # minimum mesafe filtresi
             angles.append(np.deg2rad(point.angle))
             distances.append(point.range)
-    scatter.set_offsets(np.c_[angles, distances])
+    if isinstance(scatter, PolarHistogramView):
+        scatter.update(angles, distances)
+    else:
+        scatter.set_offsets(np.c_[angles, distances])
     ax.figure.canvas.draw()
     ax.figure.canvas.flush_events()
 
@@ -22,6 +22,16 @@ except Exception:
 import ydlidar
 from ydlidar import CYdLidar
 
+from lidar_supervisor import LidarSupervisor
+from lidar_metrics import Metrics
+from lidar_lod import decimate_for_display
+from lidar_change_detect import BackgroundChangeDetector
+from lidar_tracking import ScanTracker
+from lidar_zone_monitor import ZoneMonitor, sector_zone, polygon_zone
+from lidar_deskew import scan_time_window, interpolate_timestamps, deskew_velocity, to_polar
+from lidar_simulator import SimulatedLidar, SimScan
+from lidar_polar_view import PolarHistogramView
+
 # ---- Config ----
 AUTO_FIND_PORT = True        # otomatik port bul
 PORTS_TO_TRY = None          # None => tüm /dev/ttyUSB* / ttyACM* taranır (serial.tools.list_ports ile)
@@ -30,7 +40,18 @@ SCAN_FREQUENCY = 10.0
 SAMPLE_RATE = 5.0
 LOG_TO_CSV = True            # CSV'ye kaydetmek istersen True
 CSV_DIR = "./"
-MAX_POINTS = 2000           # grafik için üst sınır (performans)
+VIEW_MODE = "scatter"       # "scatter" ya da "histogram" (sabit maliyetli sektör başına en yakın mesafe çizgisi)
+MAX_POINTS = 2000           # grafik için nokta bütçesi (LOD: açısal bölme başına en yakın nokta, bkz. lidar_lod)
+CHANGE_DETECTION = False     # arka plana göre değişen sektörleri/yeni nesne noktalarını işaretle
+OBJECT_TRACKING = False      # devir başına segmentasyon + Kalman takibi (nesne merkezleri çizilir)
+ZONE_MONITOR = False         # güvenlik bölgeleri: kayıt/çizimden önce değerlendirilir
+ZONES = [
+    sector_zone("ön", -30.0, 30.0, 0.8),
+    polygon_zone("sağ şerit", [(0.0, -0.3), (1.5, -0.3), (1.5, -1.0), (0.0, -1.0)]),
+]
+DESKEW_VELOCITY = None       # (vx m/s, vy m/s, ω rad/s) verilirse devir içi hareket bozulması giderilir
+SIMULATE = False             # gerçek cihaz yerine simüle lidar (yük testi, bkz. lidar_simulator)
+METRICS_TRACE_DUMP = True   # çıkışta aşama sürelerini Chrome trace JSON olarak kaydet
 # -----------------
 
 def find_ports():
@@ -158,28 +179,62 @@ def safe_disconnect(lidar):
 def run_radar():
     print("✅ LIDAR başlatılıyor...")
 
-    lidar, port, baud = find_and_init_lidar()
+    connect, rediscover = try_init_lidar, find_and_init_lidar
+    if SIMULATE:
+        lidar, port, baud = SimulatedLidar(sample_rate_k=SAMPLE_RATE, scan_frequency=SCAN_FREQUENCY), "sim", 0
+        lidar.turnOn()
+        connect = lambda port, baud: lidar if lidar.turnOn() else None
+        rediscover = None
+    else:
+        lidar, port, baud = find_and_init_lidar()
     if lidar is None:
         print("❌ Lidar bulunamadı. Script sonlandırılıyor.")
         return
 
     # create LaserScan container once
-    scan = create_laserscan_instance()
+    scan = SimScan() if SIMULATE else create_laserscan_instance()
+
+    # aşama süreleri / sayaçlar (log satırı + http://127.0.0.1:9108/metrics + trace)
+    metrics = Metrics()
+    metrics.serve_http()
+    last_scan_time = None
+    last_rev_end = None
 
     # Prepare CSV logging if isteniyorsa
     csv_writer = None
     csv_file = None
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     if LOG_TO_CSV:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = os.path.join(CSV_DIR, f"lidar_live_{ts}.csv")
         csv_file = open(filename, "w", newline="")
         csv_writer = csv.writer(csv_file)
         csv_writer.writerow(["timestamp", "angle_deg", "distance", "intensity"])
 
+    def mark_gap(t):
+        # kopma anını kayda NaN satırı olarak işaretle (sayısal okuyucular bozulmasın)
+        if csv_writer:
+            csv_writer.writerow([t, float("nan"), float("nan"), float("nan")])
+            csv_file.flush()
+
+    # USB kopmalarında oturumu bitirmek yerine aynı port/baud ile yeniden bağlan
+    supervisor = LidarSupervisor(lidar, port, baud,
+                                 connect=connect,
+                                 disconnect=safe_disconnect,
+                                 rediscover=rediscover,
+                                 on_disconnect=mark_gap)
+
+    zone_monitor = None
+    if ZONE_MONITOR:
+        zone_monitor = ZoneMonitor(
+            ZONES, metrics=metrics,
+            on_enter=lambda name, rng, lat: print(f"\n🚨 Bölge ihlali: {name} ({rng:.2f} m, {lat * 1000:.2f} ms)"),
+            on_exit=lambda name, lat: print(f"\n✅ Bölge temiz: {name}"))
+
     # Matplotlib setup (Cartesian)
     plt.ion()
     fig, ax = plt.subplots(figsize=(7,7))
     scatter = ax.scatter([], [], s=6)
+    hist_view = PolarHistogramView(ax, polar=False) if VIEW_MODE == "histogram" else None
     ax.set_title(f"LIDAR Live Radar — {port} @ {baud}")
     max_range_m = 6.0  # 6 meters default
     ax.set_xlim(-max_range_m, max_range_m)
@@ -187,24 +242,38 @@ def run_radar():
     ax.set_xlabel("X (m)")
     ax.set_ylabel("Y (m)")
     ax.set_aspect('equal', 'box')
+    change_detector = None
+    if CHANGE_DETECTION:
+        change_detector = BackgroundChangeDetector()
+        changed_scatter = ax.scatter([], [], s=14, c="red")
+    scan_tracker = None
+    if OBJECT_TRACKING:
+        scan_tracker = ScanTracker(metrics=metrics)
+        track_scatter = ax.scatter([], [], s=60, marker="x", c="orange")
     fig.canvas.draw()
     fig.canvas.flush_events()
 
     try:
         while True:
             # DoProcessSimple expects a LaserScan& argument (we created 'scan' instance)
-            try:
-                ok = lidar.doProcessSimple(scan)
-            except TypeError:
-                # some wrappers accept list and return points directly
-                try:
-                    ok = lidar.doProcessSimple()
-                except Exception:
-                    ok = False
+            with metrics.timer("acquire"):
+                ok = supervisor.read(scan)
 
             if ok:
+                t_arrival = time.perf_counter()
+                now = time.monotonic()
+                if last_scan_time is not None:
+                    # beklenen devir süresinin katları kadar boşluk => kaçırılmış taramalar
+                    missed = int(round((now - last_scan_time) * SCAN_FREQUENCY)) - 1
+                    if missed > 0:
+                        metrics.inc("dropped_scans", missed)
+                last_scan_time = now
+
+                t_convert = time.perf_counter_ns()
                 angles = []
                 dists = []
+                rows = []
+                n_zero = 0
                 # depending on wrapper attribute names: use .points with objects having .angle and .range
                 pts = getattr(scan, "points", None)
                 if pts is None:
@@ -216,7 +285,11 @@ def run_radar():
                     angle = getattr(p, "angle", None)
                     rng = getattr(p, "range", None) or getattr(p, "distance", None) or getattr(p, "dist", None)
                     intensity = getattr(p, "intensity", None)
-                    if angle is None or rng is None:
+                    if angle is None:
+                        continue
+                    if not rng:
+                        # sıfır dönüş (yansıma yok) - çizilmez
+                        n_zero += 1
                         continue
                     # Convert to meters if it looks like mm (heuristic: values over 1000 -> treat as mm)
                     if rng > 1000:  # likely mm
@@ -226,28 +299,66 @@ def run_radar():
                     angles.append(math.radians(angle))
                     dists.append(rng_m)
                     if csv_writer:
-                        csv_writer.writerow([time.time(), angle, rng_m, intensity])
-
-                if len(angles) == 0:
-                    # no valid points
-                    scatter.set_offsets(np.empty((0,2)))
-                else:
-                    xs = np.asarray(dists) * np.cos(np.asarray(angles))
-                    ys = np.asarray(dists) * np.sin(np.asarray(angles))
-                    points = np.c_[xs, ys]
-                    # limit to MAX_POINTS for performance
-                    if points.shape[0] > MAX_POINTS:
-                        points = points[-MAX_POINTS:, :]
-                    scatter.set_offsets(points)
-
-                    # autoscale if needed (optional) - keep fixed for stability
-                    # ax.set_xlim(-max_range_m, max_range_m)
-                    # ax.set_ylim(-max_range_m, max_range_m)
-
-                fig.canvas.draw()
-                fig.canvas.flush_events()
+                        rows.append([angle, rng_m, intensity])
+                # per-point measurement times spread over the revolution (not write time)
+                rev_start, rev_end = scan_time_window(scan, last_rev_end, time.time(), SCAN_FREQUENCY)
+                last_rev_end = rev_end
+                point_times = interpolate_timestamps(angles, rev_start, rev_end)
+                metrics.record_stage("convert", t_convert, time.perf_counter_ns())
+                metrics.record_scan(len(angles) + n_zero, n_zero)
+
+                if DESKEW_VELOCITY is not None and len(angles):
+                    # warp every point to the revolution end pose; CSV keeps raw values
+                    with metrics.timer("deskew"):
+                        angles, dists = to_polar(*deskew_velocity(angles, dists, point_times, DESKEW_VELOCITY))
+
+                # safety zones first - before any logging or rendering work
+                if zone_monitor is not None:
+                    with metrics.timer("zones"):
+                        zone_monitor.evaluate(angles, dists, t_arrival)
+
+                if csv_writer:
+                    with metrics.timer("log"):
+                        csv_writer.writerows([t] + row for t, row in zip(point_times.tolist(), rows))
+
+                if change_detector is not None:
+                    with metrics.timer("change_detect"):
+                        a_np = np.asarray(angles)
+                        r_np = np.asarray(dists)
+                        change = change_detector.update(a_np, r_np)
+                        new_idx = change["new_points"]
+                        changed_scatter.set_offsets(np.c_[r_np[new_idx] * np.cos(a_np[new_idx]),
+                                                          r_np[new_idx] * np.sin(a_np[new_idx])])
+                    if change["sectors"]:
+                        metrics.inc("changed_sectors", len(change["sectors"]))
+
+                if scan_tracker is not None:
+                    objects = scan_tracker.process(angles, dists, now)
+                    track_scatter.set_offsets(np.array([[o["x"], o["y"]] for o in objects]).reshape(-1, 2))
+
+                with metrics.timer("draw"):
+                    if hist_view is not None:
+                        hist_view.update(angles, dists)
+                    elif len(angles) == 0:
+                        # no valid points
+                        scatter.set_offsets(np.empty((0,2)))
+                    else:
+                        # reduce the whole revolution to MAX_POINTS (nearest obstacle per sector kept)
+                        with metrics.timer("lod"):
+                            xs, ys = decimate_for_display(angles, dists, MAX_POINTS)
+                        scatter.set_offsets(np.c_[xs, ys])
+
+                        # autoscale if needed (optional) - keep fixed for stability
+                        # ax.set_xlim(-max_range_m, max_range_m)
+                        # ax.set_ylim(-max_range_m, max_range_m)
+
+                    fig.canvas.draw()
+                    fig.canvas.flush_events()
+                metrics.maybe_log()
             else:
-                # no data this loop
+                # no data this loop (or reconnecting) - keep the window responsive
+                metrics.inc("empty_reads")
+                fig.canvas.flush_events()
                 time.sleep(0.01)
 
     except KeyboardInterrupt:
@@ -261,8 +372,15 @@ def run_radar():
                 csv_file.close()
         except Exception:
             pass
-        safe_disconnect(lidar)
+        supervisor.close()
         plt.close(fig)
+        metrics.close()
+        print(f"📈 {metrics.summary_line()}")
+        if METRICS_TRACE_DUMP:
+            trace_file = metrics.dump_chrome_trace(os.path.join(CSV_DIR, f"lidar_trace_{ts}.json"))
+            print(f"🧭 Trace kaydedildi: {trace_file}")
+        st = supervisor.stats()
+        print(f"🔌 Yeniden bağlanma: {st['reconnects']} kez, ortalama toparlanma süresi: {st['mean_time_to_recover_s']:.2f} s")
         if csv_writer:
             print(f"💾 CSV kaydedildi: {filename}")
 
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# lidar_lod.py
+# Ekran için seviye-of-detay (LOD): bir devri hedef nokta bütçesine indirger.
+# Her bölmede sensöre en yakın nokta korunur, böylece engeller kaybolmaz ve kör sektör oluşmaz.
+# Sadece çizim tarafı içindir; CSV'ye tam çözünürlük yazılmaya devam eder.
+
+import math
+
+import numpy as np
+
+# ---- Config ----
+LOD_MODE = "angular"         # "angular" (açısal bölme) ya da "voxel" (grid bölme)
+LOD_VOXEL_SIZE = 0.05        # voxel modunda hücre boyu (m)
+# -----------------
+
+
+def _nearest_per_bin(bin_idx, ranges):
+    """Her bölme için en küçük mesafeli noktanın indeksini döner (tek sıralama, döngü yok)."""
+    order = np.lexsort((ranges, bin_idx))
+    sorted_bins = bin_idx[order]
+    first = np.ones(order.shape[0], dtype=bool)
+    first[1:] = sorted_bins[1:] != sorted_bins[:-1]
+    return order[first]
+
+
+def angular_bin_decimate(angles, ranges, budget):
+    """
+    angles (rad) / ranges (m) dizilerini en fazla 'budget' açısal bölmeye indirger.
+    Dönen değer: korunan noktaların indeksleri (açıya göre sıralı).
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    ranges = np.asarray(ranges, dtype=np.float64)
+    n = angles.shape[0]
+    if n <= budget:
+        return np.arange(n)
+    bins = np.floor((angles % (2 * math.pi)) * (budget / (2 * math.pi))).astype(np.int64)
+    np.minimum(bins, budget - 1, out=bins)
+    return _nearest_per_bin(bins, ranges)
+
+
+def voxel_decimate(xs, ys, voxel=LOD_VOXEL_SIZE):
+    """XY düzleminde voxel başına sensöre en yakın noktayı tutar. Korunan indeksleri döner."""
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if xs.shape[0] == 0:
+        return np.arange(0)
+    ix = np.floor(xs / voxel).astype(np.int64)
+    iy = np.floor(ys / voxel).astype(np.int64)
+    # iki boyutlu hücre indeksini tek tamsayıya katla
+    ix -= ix.min()
+    iy -= iy.min()
+    cell = ix * (int(iy.max()) + 1) + iy
+    return _nearest_per_bin(cell, xs * xs + ys * ys)
+
+
+def decimate_for_display(angles, ranges, budget, mode=LOD_MODE, voxel=LOD_VOXEL_SIZE):
+    """
+    Bir devri ekran bütçesine indirger ve (xs, ys) döner.
+    Voxel modu bütçeyi aşarsa sonuç ayrıca açısal bölmeden geçirilir.
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    ranges = np.asarray(ranges, dtype=np.float64)
+    if mode == "voxel":
+        keep = voxel_decimate(ranges * np.cos(angles), ranges * np.sin(angles), voxel)
+        angles, ranges = angles[keep], ranges[keep]
+    keep = angular_bin_decimate(angles, ranges, budget)
+    a = angles[keep]
+    r = ranges[keep]
+    return r * np.cos(a), r * np.sin(a)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# lidar_metrics.py
+# Boru hattı aşamaları için hafif ölçüm katmanı: aşama süreleri, sayaçlar ve histogramlar.
+# Dışa aktarma: periyodik log satırı, localhost üzerinde Prometheus metin çıktısı, Chrome trace JSON.
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ---- Config ----
+METRICS_LOG_INTERVAL = 5.0   # periyodik log satırı aralığı (s), None => kapalı
+METRICS_HTTP_PORT = 9108     # Prometheus metin çıktısı için localhost portu, None => kapalı
+TRACE_MAX_EVENTS = 20000     # Chrome trace için tutulan en fazla olay (halka tampon)
+TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (10, 50, 100, 250, 500, 1000, 2000, 5000, 10000, 50000)
+# -----------------
+
+
+class Histogram:
+    """Sabit kovalı histogram (Prometheus 'le' semantiği: her kova kendinden küçük-eşit değerleri sayar)."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # son eleman +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "name", "t0")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter_ns()
+        self.metrics.record_stage(self.name, self.t0, t1)
+        return False
+
+
+class Metrics:
+    """
+    Aşama zamanlayıcıları, sayaçlar, anlık değerler (gauge) ve histogramlar.
+
+        metrics = Metrics()
+        with metrics.timer("acquire"):
+            ok = lidar.doProcessSimple(scan)
+        metrics.inc("scans")
+        metrics.observe("points_per_scan", len(scan.points), COUNT_BUCKETS)
+    """
+
+    def __init__(self, prefix="lidar", trace_max_events=TRACE_MAX_EVENTS):
+        self.prefix = prefix
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.trace = deque(maxlen=trace_max_events)
+        self.pid = os.getpid()
+        self.t_origin = time.perf_counter_ns()
+        self.lock = threading.Lock()
+        self._last_log = time.monotonic()
+        self._server = None
+
+    # ---- kayıt ----
+    def timer(self, name):
+        return _StageTimer(self, name)
+
+    def record_stage(self, name, t0_ns, t1_ns):
+        dur_s = (t1_ns - t0_ns) * 1e-9
+        with self.lock:
+            h = self.histograms.get("stage_seconds:" + name)
+            if h is None:
+                h = self.histograms["stage_seconds:" + name] = Histogram(TIME_BUCKETS)
+            h.observe(dur_s)
+            self.trace.append((name, t0_ns, t1_ns, threading.get_ident()))
+
+    def inc(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def observe(self, name, value, buckets=COUNT_BUCKETS):
+        with self.lock:
+            h = self.histograms.get(name)
+            if h is None:
+                h = self.histograms[name] = Histogram(buckets)
+            h.observe(value)
+
+    def record_scan(self, n_points, n_zero):
+        """Bir devir için standart sayaçlar: nokta sayısı ve sıfır mesafe oranı."""
+        self.inc("scans")
+        self.inc("points", n_points)
+        self.inc("zero_range_points", n_zero)
+        self.observe("points_per_scan", n_points)
+        self.set_gauge("zero_range_ratio", (n_zero / n_points) if n_points else 0.0)
+
+    # ---- dışa aktarma ----
+    def summary_line(self):
+        with self.lock:
+            parts = []
+            for key, h in sorted(self.histograms.items()):
+                if key.startswith("stage_seconds:"):
+                    parts.append(f"{key.split(':', 1)[1]}={h.mean() * 1000:.2f}ms")
+            for key, v in sorted(self.counters.items()):
+                parts.append(f"{key}={v}")
+            for key, v in sorted(self.gauges.items()):
+                parts.append(f"{key}={v:.3f}")
+        return " ".join(parts)
+
+    def maybe_log(self, interval=METRICS_LOG_INTERVAL):
+        """interval saniyede bir özet satırı yazdırır; döngü içinden her turda çağrılabilir."""
+        if interval is None:
+            return
+        now = time.monotonic()
+        if now - self._last_log >= interval:
+            self._last_log = now
+            print(f"📈 {self.summary_line()}")
+
+    def prometheus_text(self):
+        p = self.prefix
+        lines = []
+        with self.lock:
+            for key, v in sorted(self.counters.items()):
+                lines.append(f"# TYPE {p}_{key}_total counter")
+                lines.append(f"{p}_{key}_total {v}")
+            for key, v in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {p}_{key} gauge")
+                lines.append(f"{p}_{key} {v}")
+            for key, h in sorted(self.histograms.items()):
+                if key.startswith("stage_seconds:"):
+                    name, label = f"{p}_stage_seconds", f'stage="{key.split(":", 1)[1]}",'
+                else:
+                    name, label = f"{p}_{key}", ""
+                lines.append(f"# TYPE {name} histogram")
+                cum = 0
+                for le, c in zip(h.buckets, h.counts):
+                    cum += c
+                    lines.append(f'{name}_bucket{{{label}le="{le}"}} {cum}')
+                lines.append(f'{name}_bucket{{{label}le="+Inf"}} {h.count}')
+                tail = f"{{{label.rstrip(',')}}}" if label else ""
+                lines.append(f"{name}_sum{tail} {h.sum}")
+                lines.append(f"{name}_count{tail} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve_http(self, port=METRICS_HTTP_PORT, host="127.0.0.1"):
+        """Arka planda http://host:port/metrics adresinde Prometheus metin çıktısı sunar."""
+        if port is None or self._server is not None:
+            return None
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            print(f"⚠️ Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+            return None
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"📈 Metrikler: http://{host}:{port}/metrics")
+        return self._server
+
+    def dump_chrome_trace(self, filename):
+        """Aşama olaylarını chrome://tracing / Perfetto ile açılabilen JSON olarak yazar."""
+        with self.lock:
+            events = list(self.trace)
+        out = []
+        for name, t0, t1, tid in events:
+            out.append({
+                "name": name, "ph": "X", "pid": self.pid, "tid": tid,
+                "ts": (t0 - self.t_origin) / 1000.0,
+                "dur": (t1 - t0) / 1000.0,
+            })
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": out, "displayTimeUnit": "ms"}, f)
+        return filename
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# lidar_polar_view.py
+# Scatter yerine sabit boyutlu polar histogram görünümü.
+# Her devir sabit bir açısal ızgaraya (ör. 360 / 720 sektör) en yakın mesafe olarak bölünür ve
+# önceden oluşturulmuş TEK bir çizgi (Line2D) yerinde güncellenir. Sensör kaç nokta üretirse
+# üretsin çizim maliyeti sabit kalır.
+
+import math
+
+import numpy as np
+
+# ---- Config ----
+VIEW_SECTORS = 360           # sektör sayısı (360 => 1°, 720 => 0.5°)
+# -----------------
+
+
+class PolarHistogramView:
+    """
+    polar=True  => ax polar eksen (lidar_live_plot), çizgi (θ, r) ile çizilir
+    polar=False => ax kartezyen eksen (lidar_live_radar), çizgi (x, y) ile çizilir
+
+        view = PolarHistogramView(ax, polar=False)
+        view.update(angles_rad, ranges_m)
+        fig.canvas.draw()
+    """
+
+    def __init__(self, ax, n_sectors=VIEW_SECTORS, polar=True, **line_kwargs):
+        self.ax = ax
+        self.n_sectors = n_sectors
+        self.polar = polar
+        self._scale = n_sectors / (2 * math.pi)
+        # sektör merkezleri; çizginin kapanması için ilk sektör sona tekrar eklenir
+        theta = (np.arange(n_sectors + 1) % n_sectors + 0.5) / self._scale
+        self._theta = theta
+        self._cos = np.cos(theta)
+        self._sin = np.sin(theta)
+        self._nearest = np.full(n_sectors, np.inf)
+        self._r = np.full(n_sectors + 1, np.nan)
+        self._x = np.full(n_sectors + 1, np.nan)
+        self._y = np.full(n_sectors + 1, np.nan)
+        line_kwargs.setdefault("lw", 1.2)
+        if polar:
+            (self.line,) = ax.plot(self._theta, self._r, **line_kwargs)
+        else:
+            (self.line,) = ax.plot(self._x, self._y, **line_kwargs)
+
+    def bin(self, angles_rad, ranges_m):
+        """Sektör başına en yakın mesafe (dönüşü olmayan sektörler NaN)."""
+        r = np.asarray(ranges_m, dtype=np.float64)
+        valid = np.isfinite(r) & (r > 0)
+        idx = np.floor((np.asarray(angles_rad, dtype=np.float64)[valid] % (2 * math.pi)) * self._scale).astype(np.int64)
+        np.minimum(idx, self.n_sectors - 1, out=idx)
+        self._nearest.fill(np.inf)
+        np.minimum.at(self._nearest, idx, r[valid])
+        self._r[:-1] = self._nearest
+        self._r[-1] = self._nearest[0]
+        self._r[np.isinf(self._r)] = np.nan       # boş sektör => çizgide boşluk
+        return self._r[:-1]
+
+    def update(self, angles_rad, ranges_m):
+        """Devri bölüp tek çizgiyi yerinde günceller; artist sayısı ve boyutu değişmez."""
+        self.bin(angles_rad, ranges_m)
+        if self.polar:
+            self.line.set_ydata(self._r)
+        else:
+            np.multiply(self._r, self._cos, out=self._x)
+            np.multiply(self._r, self._sin, out=self._y)
+            self.line.set_data(self._x, self._y)
+        return self.line
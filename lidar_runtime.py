@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# lidar_runtime.py
+# Edinim, işleme ve çizimi ayrı işçiler (süreçler) olarak çalıştıran çalışma zamanı.
+# Her işçiye CPU ataması (os.sched_setaffinity), nice değeri ve okuyucu için isteğe bağlı
+# gerçek zamanlı zamanlama (SCHED_FIFO) verilebilir. Edinim döngüsünün zamanlama sapması (jitter)
+# ölçülüp raporlanır; böylece arayüz meşgulken tarama zamanlamasının kararlı kaldığı gösterilebilir.
+#
+#   acquisition (süreç) --q--> processing (süreç: CSV kaydı + LOD) --q--> rendering (ana süreç: matplotlib)
+#
+# Kullanım:
+#   python lidar_runtime.py            # gerçek cihaz
+#   python lidar_runtime.py --sim      # simüle lidar ile
+
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+# ---- Config ----
+# 4 çekirdekli ARM kartlar için varsayılan yerleşim; None => dokunma
+WORKERS = {
+    "acquisition": {"cpus": {0}, "nice": -5, "realtime": 50},    # SCHED_FIFO önceliği (1-99) ya da None
+    "processing": {"cpus": {1, 2}, "nice": 0, "realtime": None},
+    "rendering": {"cpus": {3}, "nice": 5, "realtime": None},
+}
+SCAN_FREQUENCY = 10.0
+QUEUE_SIZE = 8               # işçiler arası en fazla bekleyen devir (dolarsa devir düşürülür ve sayılır)
+JITTER_REPORT_INTERVAL = 5.0 # s
+JITTER_WINDOW = 1000         # jitter istatistiği için son N aralık
+LOG_TO_CSV = True
+CSV_DIR = "./"
+DISPLAY_POINTS = 2000
+# -----------------
+
+
+def apply_sched(role, cpus=None, nice=None, realtime=None):
+    """Çağıran sürece CPU ataması / nice / gerçek zamanlı öncelik uygular. Uygulananları döner."""
+    applied = {}
+    if cpus:
+        try:
+            # kartta olmayan çekirdekler atlanır (ör. 4 çekirdek için yazılmış yerleşim 2 çekirdekte)
+            usable = set(cpus) & os.sched_getaffinity(0)
+            if usable:
+                os.sched_setaffinity(0, usable)
+                applied["cpus"] = sorted(os.sched_getaffinity(0))
+            else:
+                print(f"⚠️ [{role}] istenen çekirdekler ({sorted(cpus)}) bu sistemde yok, atama atlandı")
+        except (AttributeError, OSError, ValueError) as e:
+            print(f"⚠️ [{role}] CPU ataması uygulanamadı ({sorted(cpus)}): {e}")
+    if nice is not None:
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+            applied["nice"] = os.getpriority(os.PRIO_PROCESS, 0)
+        except (AttributeError, OSError) as e:
+            print(f"⚠️ [{role}] nice={nice} uygulanamadı (negatif değerler yetki ister): {e}")
+    if realtime:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(realtime))
+            applied["realtime"] = realtime
+        except (AttributeError, OSError) as e:
+            print(f"⚠️ [{role}] SCHED_FIFO {realtime} uygulanamadı (CAP_SYS_NICE gerekir): {e}")
+    print(f"⚙️ [{role}] pid={os.getpid()} {applied or 'varsayılan zamanlama'}")
+    return applied
+
+
+class JitterMonitor:
+    """Ardışık devir varış aralıklarının beklenen periyottan sapmasını izler."""
+
+    def __init__(self, period, window=JITTER_WINDOW):
+        self.period = period
+        self.intervals = deque(maxlen=window)
+        self.last = None
+        self.count = 0
+
+    def record(self, t):
+        if self.last is not None:
+            self.intervals.append(t - self.last)
+        self.last = t
+        self.count += 1
+
+    def summary(self):
+        if not self.intervals:
+            return {"scans": self.count}
+        iv = np.fromiter(self.intervals, dtype=np.float64)
+        dev = np.abs(iv - self.period)
+        return {
+            "scans": self.count,
+            "interval_mean_ms": round(float(iv.mean()) * 1000, 3),
+            "jitter_std_ms": round(float(iv.std()) * 1000, 3),
+            "jitter_p99_ms": round(float(np.percentile(dev, 99)) * 1000, 3),
+            "jitter_max_ms": round(float(dev.max()) * 1000, 3),
+        }
+
+
+def scan_to_arrays(scan):
+    """LaserScan -> (açılar rad, mesafeler m, şiddet) dizileri (lidar_live_radar ile aynı kurallar)."""
+    if getattr(scan, "angles", None) is not None and len(getattr(scan, "angles")):
+        # SimScan hızlı yolu
+        return np.asarray(scan.angles), np.asarray(scan.ranges), None
+    pts = getattr(scan, "points", None)
+    if pts is None:
+        pts = scan
+    raw = [(p.angle, p.range, getattr(p, "intensity", 0.0)) for p in pts]
+    if not raw:
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+    arr = np.asarray(raw, dtype=np.float64)
+    rng = arr[:, 1]
+    rng = np.where(rng > 1000, rng / 1000.0, rng)      # mm gibi görünüyorsa metreye çevir
+    return np.radians(arr[:, 0]), rng, arr[:, 2]
+
+
+def _put(q, item, stats, key):
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        stats[key] = stats.get(key, 0) + 1
+
+
+def acquisition_worker(out_q, stop, sched, simulate):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    apply_sched("acquisition", **sched)
+    from lidar_supervisor import LidarSupervisor
+
+    stats = {}
+    if simulate:
+        from lidar_simulator import SimulatedLidar, SimScan
+        lidar, port, baud = SimulatedLidar(scan_frequency=SCAN_FREQUENCY), "sim", 0
+        lidar.turnOn()
+        scan = SimScan()
+        connect = lambda port, baud: lidar if lidar.turnOn() else None
+        disconnect, rediscover = (lambda l: l.turnOff()), None
+    else:
+        from lidar_live_radar import create_laserscan_instance, find_and_init_lidar, safe_disconnect, try_init_lidar
+        lidar, port, baud = find_and_init_lidar()
+        if lidar is None:
+            print("❌ Lidar bulunamadı.")
+            out_q.put(("done", "acquisition", {}))
+            return
+        scan = create_laserscan_instance()
+        connect, disconnect, rediscover = try_init_lidar, safe_disconnect, find_and_init_lidar
+
+    supervisor = LidarSupervisor(lidar, port, baud, connect=connect, disconnect=disconnect,
+                                 rediscover=rediscover,
+                                 on_disconnect=lambda t: _put(out_q, ("gap", t), stats, "dropped_gap"))
+    jitter = JitterMonitor(1.0 / SCAN_FREQUENCY)
+    last_report = time.monotonic()
+    try:
+        while not stop.is_set():
+            if not supervisor.read(scan):
+                time.sleep(0.001)
+                continue
+            t_arrival = time.monotonic()
+            jitter.record(t_arrival)
+            angles, ranges, intensity = scan_to_arrays(scan)
+            # SDK LaserScan süreçler arası taşınamaz: zaman penceresi için stamp / scan_time ayrıca gönderilir
+            cfg = getattr(scan, "config", None)
+            stamp = (getattr(scan, "stamp", 0) or 0, getattr(cfg, "scan_time", 0.0) if cfg is not None else 0.0)
+            _put(out_q, ("scan", time.time(), stamp, angles, ranges, intensity), stats, "dropped_to_processing")
+            if t_arrival - last_report >= JITTER_REPORT_INTERVAL:
+                last_report = t_arrival
+                _put(out_q, ("stats", "acquisition", {**jitter.summary(), **stats}), stats, "dropped_stats")
+    finally:
+        supervisor.close()
+        out_q.put(("done", "acquisition", {**jitter.summary(), **stats, **supervisor.stats()}))
+
+
+def processing_worker(in_q, out_q, sched):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    apply_sched("processing", **sched)
+    import csv
+    from types import SimpleNamespace
+
+    from lidar_deskew import interpolate_timestamps, scan_time_window
+    from lidar_lod import decimate_for_display
+
+    csv_file = csv_writer = None
+    if LOG_TO_CSV:
+        filename = os.path.join(CSV_DIR, f"lidar_live_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        csv_file = open(filename, "w", newline="")
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(["timestamp", "angle_deg", "distance", "intensity"])
+    stats = {}
+    last_t = None
+    try:
+        while True:
+            try:
+                msg = in_q.get(timeout=0.2)
+            except queue.Empty:
+                continue            # durdurulsa bile edinimin "done" mesajı beklenir
+            kind = msg[0]
+            if kind == "done":
+                out_q.put(msg)
+                break
+            if kind == "stats":
+                _put(out_q, msg, stats, "dropped_stats")
+                continue
+            if kind == "gap":
+                if csv_writer:
+                    csv_writer.writerow([msg[1], float("nan"), float("nan"), float("nan")])
+                last_t = None
+                continue
+
+            _, t_now, (stamp, scan_time), angles, ranges, intensity = msg
+            valid = ranges > 0
+            # lidar_live_radar ile aynı kural: SDK stamp/scan_time, yoksa önceki devir sonu
+            # (kuyrukta devir düşmüşse 2.5 periyot üstü boşlukta tek periyotla sınırlanır)
+            t_start, t_end = scan_time_window(SimpleNamespace(stamp=stamp, config=SimpleNamespace(scan_time=scan_time)),
+                                              last_t, t_now, SCAN_FREQUENCY)
+            if csv_writer:
+                # tam çözünürlük kayıt, nokta başına enterpole edilmiş zaman
+                a, r = angles[valid], ranges[valid]
+                ts = interpolate_timestamps(a, t_start, t_end)
+                inten = intensity[valid] if intensity is not None else np.full(a.shape[0], np.nan)
+                csv_writer.writerows(zip(ts.tolist(), np.degrees(a).tolist(), r.tolist(), inten.tolist()))
+            last_t = t_end
+            xs, ys = decimate_for_display(angles[valid], ranges[valid], DISPLAY_POINTS)
+            _put(out_q, ("display", xs, ys), stats, "dropped_to_rendering")
+    finally:
+        if csv_file:
+            csv_file.close()
+            print(f"💾 CSV kaydedildi: {csv_file.name}")
+        out_q.put(("done", "processing", stats))
+
+
+def run(simulate=False, workers=WORKERS):
+    import matplotlib.pyplot as plt
+
+    ctx = mp.get_context("spawn" if sys.platform == "darwin" else "fork")
+    stop = ctx.Event()
+    q_acq = ctx.Queue(QUEUE_SIZE)
+    q_disp = ctx.Queue(QUEUE_SIZE)
+    procs = [
+        ctx.Process(target=acquisition_worker, args=(q_acq, stop, workers["acquisition"], simulate),
+                    name="lidar-acquisition", daemon=True),
+        ctx.Process(target=processing_worker, args=(q_acq, q_disp, workers["processing"]),
+                    name="lidar-processing", daemon=True),
+    ]
+    for p in procs:
+        p.start()
+    apply_sched("rendering", **workers["rendering"])
+
+    plt.ion()
+    fig, ax = plt.subplots(figsize=(7, 7))
+    scatter = ax.scatter([], [], s=6)
+    ax.set_xlim(-6, 6)
+    ax.set_ylim(-6, 6)
+    ax.set_aspect("equal", "box")
+    ax.set_title("LIDAR Runtime")
+    fig.canvas.draw()
+
+    final = {}
+    draw_times = deque(maxlen=200)
+    try:
+        while all(p.is_alive() for p in procs) or not q_disp.empty():
+            latest = None
+            try:
+                while True:
+                    msg = q_disp.get_nowait()
+                    if msg[0] == "display":
+                        latest = msg
+                    elif msg[0] == "stats":
+                        print(f"⏱️ [{msg[1]}] {msg[2]}")
+                    elif msg[0] == "done":
+                        final[msg[1]] = msg[2]
+            except queue.Empty:
+                pass
+            if latest is None:
+                fig.canvas.flush_events()
+                time.sleep(0.005)
+                continue
+            t0 = time.perf_counter()
+            scatter.set_offsets(np.c_[latest[1], latest[2]])
+            fig.canvas.draw()
+            fig.canvas.flush_events()
+            draw_times.append(time.perf_counter() - t0)
+    except KeyboardInterrupt:
+        print("\n🛑 Kullanıcı tarafından durduruldu (CTRL+C).")
+    finally:
+        stop.set()
+        # kuyrukları boşaltarak işçilerin "done" mesajlarını topla (join'den önce: dolu kuyruk kilitlenmesin)
+        deadline = time.monotonic() + 5.0
+        while len(final) < 2 and time.monotonic() < deadline:
+            try:
+                msg = q_disp.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if msg[0] == "done":
+                final[msg[1]] = msg[2]
+        for p in procs:
+            p.join(timeout=2.0)
+            if p.is_alive():
+                p.terminate()
+        plt.close(fig)
+        if draw_times:
+            final["rendering"] = {"draw_mean_ms": round(1000 * sum(draw_times) / len(draw_times), 2)}
+        for role, st in final.items():
+            print(f"📊 [{role}] {st}")
+
+
+if __name__ == "__main__":
+    run(simulate="--sim" in sys.argv)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# lidar_simulator.py
+# Yük testi için sentetik tarama üreteci: CYdLidar yerine geçen simüle lidar.
+# Yapılandırılabilir 2D sahne (duvar parçaları + hareketli kutular) istenen örnek hızı ve
+# tarama frekansında ışın izleme (ray-cast) ile taranır; gürültü ve kayıtlarımızdaki gibi
+# sıfır dönüşler (dropout) ardışık patlamalar halinde eklenir. Böylece işleme, kayıt ve çizim aşamaları donanımımızın
+# üstündeki hızlarda doyuma kadar zorlanabilir.
+#
+# Kullanım:
+#   python lidar_simulator.py --bench            # aşama başına verim tavanı
+#   lidar = SimulatedLidar(sample_rate_k=20, scan_frequency=15)   # CYdLidar yerine
+
+import math
+import sys
+import time
+
+import numpy as np
+
+# ---- Config ----
+SIM_SAMPLE_RATE_K = 5.0      # bin örnek/s (SAMPLE_RATE ile aynı birim)
+SIM_SCAN_FREQUENCY = 10.0    # Hz
+SIM_RANGE_NOISE = 0.01       # mesafe gürültüsü std (m)
+# sıfır dönüşler iki durumlu Markov zinciri (iyi/kayıp) ile üretilir; varsayılanlar
+# lidar_data_20251022_091026.csv'den: %24.3 sıfır, patlama uzunluğu ort. 3.25 (medyan 2, p90 7, maks 19)
+SIM_DROPOUT = 0.243          # uzun vadeli sıfır dönüş oranı
+SIM_DROPOUT_BURST = 3.25     # ortalama ardışık sıfır dönüş uzunluğu (1 => bağımsız tek noktalar)
+SIM_MAX_RANGE = 12.0         # bu mesafeden uzak ışınlar sıfır döner (m)
+SIM_REALTIME = True          # doProcessSimple gerçek devir süresini bekler; False => mümkün olan en hızlı
+SIM_ANGLE_DEGREES = True     # radar scriptleri p.angle'ı derece kabul eder; False => SDK gibi radyan
+# -----------------
+
+
+class SimPoint:
+    __slots__ = ("angle", "range", "intensity")
+
+    def __init__(self, angle, rng, intensity):
+        self.angle = angle
+        self.range = rng
+        self.intensity = intensity
+
+
+class SimScan:
+    """LaserScan benzeri kap: .points listesi + .stamp (ns) + numpy dizileri (hızlı yol için)."""
+
+    def __init__(self):
+        self.points = []
+        self.stamp = 0
+        self.angles = np.zeros(0)
+        self.ranges = np.zeros(0)
+
+
+def default_scene():
+    """4x6 m oda + iki hareketli kutu. Duvarlar: (x1, y1, x2, y2) parçaları."""
+    walls = [(-3.0, -2.0, 3.0, -2.0), (3.0, -2.0, 3.0, 2.0), (3.0, 2.0, -3.0, 2.0), (-3.0, 2.0, -3.0, -2.0),
+             (0.5, 0.8, 1.5, 0.8)]
+    # kutular: merkez (x, y), yarı boyut (hx, hy), hız (vx, vy) — duvarlardan sekerler
+    boxes = [
+        {"c": [1.0, -1.0], "h": [0.25, 0.25], "v": [0.6, 0.3]},
+        {"c": [-1.5, 0.5], "h": [0.15, 0.4], "v": [-0.2, 0.5]},
+    ]
+    return {"walls": walls, "boxes": boxes, "bounds": (-3.0, -2.0, 3.0, 2.0)}
+
+
+def _box_segments(box):
+    cx, cy = box["c"]
+    hx, hy = box["h"]
+    x0, x1, y0, y1 = cx - hx, cx + hx, cy - hy, cy + hy
+    return [(x0, y0, x1, y0), (x1, y0, x1, y1), (x1, y1, x0, y1), (x0, y1, x0, y0)]
+
+
+def raycast(angles_rad, segments, max_range=SIM_MAX_RANGE):
+    """Orijinden çıkan ışınların parçalara en yakın kesişim mesafesi; kesişim yoksa inf."""
+    seg = np.asarray(segments, dtype=np.float64)
+    px, py = seg[:, 0][None, :], seg[:, 1][None, :]
+    ex, ey = (seg[:, 2] - seg[:, 0])[None, :], (seg[:, 3] - seg[:, 1])[None, :]
+    dx = np.cos(angles_rad)[:, None]
+    dy = np.sin(angles_rad)[:, None]
+    denom = dx * ey - dy * ex
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (px * ey - py * ex) / denom
+        u = (px * dy - py * dx) / denom
+    hit = (np.abs(denom) > 1e-12) & (t > 0) & (u >= 0) & (u <= 1) & (t <= max_range)
+    return np.where(hit, t, np.inf).min(axis=1)
+
+
+class SimulatedLidar:
+    """
+    CYdLidar arayüzünün taklidi (setlidaropt / initialize / turnOn / doProcessSimple /
+    turnOff / disconnecting). doProcessSimple(scan) bir devri ışın izleme ile üretir.
+    """
+
+    def __init__(self, scene=None, sample_rate_k=SIM_SAMPLE_RATE_K, scan_frequency=SIM_SCAN_FREQUENCY,
+                 noise=SIM_RANGE_NOISE, dropout=SIM_DROPOUT, dropout_burst=SIM_DROPOUT_BURST,
+                 realtime=SIM_REALTIME, seed=None, build_points=True, angle_degrees=SIM_ANGLE_DEGREES):
+        self.scene = scene or default_scene()
+        self.sample_rate_k = sample_rate_k
+        self.scan_frequency = scan_frequency
+        self.noise = noise
+        self.dropout = dropout
+        self.dropout_burst = max(1.0, dropout_burst)
+        self._in_burst = False             # son noktanın durumu (patlamalar devir sınırını aşabilir)
+        self.realtime = realtime
+        self.build_points = build_points   # False => sadece scan.angles/ranges (nesne oluşturma maliyeti yok)
+        self.angle_degrees = angle_degrees
+        self.rng = np.random.default_rng(seed)
+        self.running = False
+        self.sim_time = 0.0
+        self._next_due = None
+        self.opts = {}
+
+    # ---- CYdLidar uyumluluğu ----
+    def setlidaropt(self, key, value):
+        self.opts[key] = value
+        return True
+
+    def initialize(self):
+        return True
+
+    def turnOn(self):
+        self.running = True
+        self._next_due = time.monotonic()
+        return True
+
+    def turnOff(self):
+        self.running = False
+        return True
+
+    def disconnecting(self):
+        self.running = False
+
+    disconnect = disconnecting
+
+    # ---- simülasyon ----
+    def points_per_scan(self):
+        return max(1, int(round(self.sample_rate_k * 1000.0 / self.scan_frequency)))
+
+    def _advance_scene(self, dt):
+        xmin, ymin, xmax, ymax = self.scene["bounds"]
+        for b in self.scene["boxes"]:
+            for k, (lo, hi) in enumerate(((xmin, xmax), (ymin, ymax))):
+                b["c"][k] += b["v"][k] * dt
+                if b["c"][k] - b["h"][k] < lo or b["c"][k] + b["h"][k] > hi:
+                    b["v"][k] = -b["v"][k]
+                    b["c"][k] = min(max(b["c"][k], lo + b["h"][k]), hi - b["h"][k])
+
+    def generate(self):
+        """Bir devrin (açılar rad, mesafeler m, şiddet) dizilerini üretir."""
+        period = 1.0 / self.scan_frequency
+        self._advance_scene(period)
+        self.sim_time += period
+        n = self.points_per_scan()
+        angles = -math.pi + (np.arange(n) + self.rng.random()) * (2 * math.pi / n)
+        segments = list(self.scene["walls"])
+        for b in self.scene["boxes"]:
+            segments.extend(_box_segments(b))
+        ranges = raycast(angles, segments)
+        ranges = ranges + self.rng.normal(0.0, self.noise, n)
+        drop = ~np.isfinite(ranges) | self._dropout_mask(n)
+        ranges[drop] = 0.0
+        intensity = np.where(drop, 0.0, np.clip(1000.0 / (1.0 + ranges * ranges), 0, 255)).round()
+        return angles, ranges, intensity
+
+    def _dropout_mask(self, n):
+        """
+        İki durumlu Markov zinciri: kayıp durumunda kalma olasılığı 1 - 1/burst, iyi -> kayıp geçişi
+        durağan oran dropout olacak şekilde seçilir. Koşu uzunlukları geometrik olduğundan zincir
+        nokta nokta değil, koşu koşu (vektörel) üretilir.
+        """
+        mask = np.zeros(n, dtype=bool)
+        if self.dropout <= 0 or n == 0:
+            return mask
+        p_exit = 1.0 / self.dropout_burst                                  # kayıp -> iyi
+        p_enter = min(1.0, p_exit * self.dropout / max(1e-9, 1.0 - self.dropout))   # iyi -> kayıp
+        # ilk noktanın durumu bir önceki devrin son noktasından geçişle belirlenir
+        bad = self.rng.random() < ((1.0 - p_exit) if self._in_burst else p_enter)
+        pos = 0
+        while pos < n:
+            m = int(n * p_enter) + 8
+            bad_runs = self.rng.geometric(p_exit, m)
+            good_runs = self.rng.geometric(p_enter, m) if p_enter < 1.0 else np.zeros(m, dtype=np.int64)
+            runs = np.empty(2 * m, dtype=np.int64)
+            runs[0::2], runs[1::2] = (bad_runs, good_runs) if bad else (good_runs, bad_runs)
+            bounds = pos + np.concatenate(([0], np.cumsum(runs)))
+            starts = np.minimum(bounds[:-1], n)
+            ends = np.minimum(bounds[1:], n)
+            first_bad = 0 if bad else 1
+            for s, e in zip(starts[first_bad::2], ends[first_bad::2]):
+                mask[s:e] = True
+            pos = int(bounds[-1])
+        self._in_burst = bool(mask[-1])
+        return mask
+
+    def doProcessSimple(self, scan=None):
+        """scan verilirse doldurup True döner; verilmezse (eski wrapper'lar gibi) nokta listesini döner."""
+        if not self.running:
+            return False
+        if self.realtime:
+            now = time.monotonic()
+            if now < self._next_due:
+                time.sleep(self._next_due - now)
+            self._next_due = max(self._next_due + 1.0 / self.scan_frequency, time.monotonic() - 1.0)
+        angles, ranges, intensity = self.generate()
+        out = scan if scan is not None else SimScan()
+        self._fill(out, angles, ranges, intensity)
+        return True if scan is not None else out.points
+
+    def _fill(self, scan, angles, ranges, intensity):
+        scan.angles = angles
+        scan.ranges = ranges
+        scan.stamp = int(time.time() * 1e9)
+        if self.build_points:
+            pa = (np.degrees(angles) if self.angle_degrees else angles).tolist()
+            scan.points = [SimPoint(a, r, i) for a, r, i in zip(pa, ranges.tolist(), intensity.tolist())]
+
+
+# ---------- verim tavanı ölçümü ----------
+
+def _rate(fn, seconds=1.0):
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def benchmark(sample_rates_k=(5, 10, 20, 40), scan_frequency=10.0, seconds=1.0):
+    """Her örnek hızında aşama başına saniyedeki devir sayısı tavanını yazdırır."""
+    import csv
+    import io
+
+    from lidar_lod import decimate_for_display
+    from lidar_tracking import ScanTracker
+    from lidar_change_detect import BackgroundChangeDetector
+
+    print(f"⏱️ Aşama başına tavan (devir/s), hedef {scan_frequency:g} Hz")
+    for k in sample_rates_k:
+        sim = SimulatedLidar(sample_rate_k=k, scan_frequency=scan_frequency, realtime=False, seed=0)
+        sim.turnOn()
+        scan = SimScan()
+        sim.doProcessSimple(scan)
+        a, r = scan.angles, scan.ranges
+        rows = [[0.0, p.angle, p.range, p.intensity] for p in scan.points]
+        det = BackgroundChangeDetector()
+        trk = ScanTracker()
+
+        def convert():
+            # lidar_live_radar ile aynı nokta döngüsü
+            out = []
+            for p in scan.points:
+                if p.range:
+                    out.append((math.radians(p.angle), p.range))
+            return out
+
+        def log():
+            csv.writer(io.StringIO()).writerows(rows)
+
+        stages = {
+            "generate": lambda: sim.doProcessSimple(scan),
+            "convert": convert,
+            "log_csv": log,
+            "lod": lambda: decimate_for_display(a, r, 2000),
+            "change": lambda: det.update(a, r),
+            "track": lambda: trk.process(a, r),
+        }
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(figsize=(7, 7))
+            sc = ax.scatter([], [], s=6)
+            ax.set_xlim(-6, 6)
+            ax.set_ylim(-6, 6)
+            xy = np.c_[r * np.cos(a), r * np.sin(a)]
+
+            def draw():
+                sc.set_offsets(xy)
+                fig.canvas.draw()
+            stages["draw"] = draw
+        except ImportError:
+            fig = None
+
+        results = {name: _rate(fn, seconds) for name, fn in stages.items()}
+        if fig is not None:
+            plt.close(fig)
+        line = "  ".join(f"{name}={v:8.1f}{'' if v >= scan_frequency else ' ⚠️'}" for name, v in results.items())
+        print(f"  {k:4g}k örnek/s ({sim.points_per_scan():5d} nokta/devir): {line}")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        print("Kullanım: python lidar_simulator.py --bench")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# lidar_supervisor.py
+# USB bağlantısı koptuğunda ya da veri akışı durduğunda lidar'ı yeniden bağlayan oturum denetleyicisi.
+# Yeniden bağlanma bloklamaz: denemeler (initialize/turnOn ve port taraması) arka plan thread'inde yapılır,
+# bağlantı yokken read() hemen False döner, böylece çizim ve kayıt döngüsü yaşamaya devam eder.
+
+import threading
+import time
+
+# ---- Config ----
+STALL_TIMEOUT = 2.0          # bu kadar saniye geçerli tarama gelmezse akış durmuş sayılır
+BACKOFF_INITIAL = 0.5        # ilk yeniden bağlanma denemesinden önce bekleme (s)
+BACKOFF_MAX = 10.0           # bekleme üst sınırı (s)
+REDISCOVER_AFTER = 5         # aynı port/baud ile bu kadar başarısız denemeden sonra portları yeniden tara
+# -----------------
+
+
+def process_simple(lidar, scan):
+    """doProcessSimple çağrısı; bazı wrapper'lar argümansız çalışır."""
+    try:
+        return lidar.doProcessSimple(scan)
+    except TypeError:
+        return lidar.doProcessSimple()
+
+
+class LidarSupervisor:
+    """
+    Lidar sürücüsünü sarar: hata veya durma algılanınca son bilinen port/baud ile
+    üstel bekleme (backoff) kullanarak yeniden bağlanır ve kopma aralıklarını bildirir.
+
+    connect(port, baud)  -> lidar ya da None   (ör. lidar_live_radar.try_init_lidar)
+    disconnect(lidar)                          (ör. lidar_live_radar.safe_disconnect)
+    rediscover()         -> (lidar, port, baud) (opsiyonel, ör. find_and_init_lidar)
+    on_disconnect(t)     kopma anında çağrılır (kayda boşluk işareti koymak için)
+    on_reconnect(t, downtime) bağlantı geri geldiğinde çağrılır
+    """
+
+    def __init__(self, lidar, port, baud, connect, disconnect,
+                 rediscover=None, on_disconnect=None, on_reconnect=None,
+                 stall_timeout=STALL_TIMEOUT):
+        self.lidar = lidar
+        self.port = port
+        self.baud = baud
+        self.connect = connect
+        self.disconnect = disconnect
+        self.rediscover = rediscover
+        self.on_disconnect = on_disconnect
+        self.on_reconnect = on_reconnect
+        self.stall_timeout = stall_timeout
+
+        self.connected = lidar is not None
+        self.last_ok_time = time.monotonic()
+        self.lost_at = None          # kopma anı (monotonic)
+        self.next_attempt = 0.0
+        self.attempts = 0
+        self._worker = None          # süren yeniden bağlanma denemesi (thread)
+        self._result = None          # (lidar, port, baud) — thread tarafından doldurulur
+
+        self.reconnect_count = 0
+        self.recover_times = []
+
+    def read(self, scan):
+        """Bir tarama okur. Bağlantı yoksa ya da veri gelmediyse False döner, asla exception fırlatmaz."""
+        now = time.monotonic()
+        if not self.connected:
+            if self._worker is not None:
+                if not self._worker.is_alive():
+                    self._finish_reconnect()
+            elif now >= self.next_attempt:
+                self._start_reconnect()
+            return False
+
+        try:
+            ok = process_simple(self.lidar, scan)
+        except Exception as e:
+            print(f"\n⚠️ Lidar okuma hatası: {e}")
+            self._mark_lost(now)
+            return False
+
+        if ok:
+            self.last_ok_time = now
+            return True
+        if now - self.last_ok_time > self.stall_timeout:
+            print(f"\n⚠️ {self.stall_timeout:.1f} s boyunca veri gelmedi, akış durmuş sayılıyor.")
+            self._mark_lost(now)
+        return False
+
+    def _mark_lost(self, now):
+        self.connected = False
+        self.lost_at = now
+        self.attempts = 0
+        self.next_attempt = now + BACKOFF_INITIAL
+        try:
+            self.disconnect(self.lidar)
+        except Exception:
+            pass
+        self.lidar = None
+        if self.on_disconnect:
+            self.on_disconnect(time.time())
+
+    def _start_reconnect(self):
+        self.attempts += 1
+        print(f"🔄 Yeniden bağlanılıyor ({self.attempts}. deneme): {self.port} @ {self.baud}")
+        rediscover = self.rediscover is not None and self.attempts % REDISCOVER_AFTER == 0
+        self._result = None
+        self._worker = threading.Thread(target=self._reconnect_work, args=(self.port, self.baud, rediscover),
+                                        name="lidar-reconnect", daemon=True)
+        self._worker.start()
+
+    def _reconnect_work(self, port, baud, rediscover):
+        """Arka plan thread'i: sadece sürücü çağrıları; durum ve callback'ler read() tarafında güncellenir."""
+        lidar = None
+        try:
+            lidar = self.connect(port, baud)
+        except Exception:
+            lidar = None
+        if lidar is None and rediscover:
+            # cihaz farklı bir port numarasıyla geri gelmiş olabilir (ttyUSB0 -> ttyUSB1)
+            try:
+                lidar, port, baud = self.rediscover()
+            except Exception:
+                lidar = None
+        self._result = (lidar, port, baud)
+
+    def _finish_reconnect(self):
+        self._worker = None
+        lidar, port, baud = self._result or (None, None, None)
+        done = time.monotonic()
+        if lidar is None:
+            delay = min(BACKOFF_MAX, BACKOFF_INITIAL * (2 ** self.attempts))
+            self.next_attempt = done + delay
+            return
+
+        self.port, self.baud = port, baud
+        downtime = done - self.lost_at
+        self.lidar = lidar
+        self.connected = True
+        self.last_ok_time = done
+        self.reconnect_count += 1
+        self.recover_times.append(downtime)
+        print(f"✅ Yeniden bağlandı: {self.port} @ {self.baud} ({downtime:.2f} s kesinti)")
+        if self.on_reconnect:
+            self.on_reconnect(time.time(), downtime)
+
+    def mean_time_to_recover(self):
+        if not self.recover_times:
+            return 0.0
+        return sum(self.recover_times) / len(self.recover_times)
+
+    def stats(self):
+        return {
+            "reconnects": self.reconnect_count,
+            "mean_time_to_recover_s": self.mean_time_to_recover(),
+            "connected": self.connected,
+        }
+
+    def close(self):
+        if self._worker is not None:
+            # süren deneme bitince açtığı cihaz da kapatılmalı
+            self._worker.join(timeout=5.0)
+            if not self._worker.is_alive() and self._result and self._result[0] is not None:
+                self.lidar = self._result[0]
+            self._worker = None
+        if self.lidar is not None:
+            self.disconnect(self.lidar)
+            self.lidar = None
+        self.connected = False
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# lidar_tracking.py
+# Bir devir üzerinde nesne kümeleme ve çoklu nesne takibi.
+#  1) Komşu ışın kırılma noktası (breakpoint) segmentasyonu: açıya göre sıralı ardışık noktalar
+#     arasındaki mesafe uyarlamalı eşiği aşınca yeni segment başlar (tamamen vektörel).
+#  2) Takip: en yakın komşu eşleştirme (gating ile) + sabit hızlı Kalman filtresi,
+#     tüm izler için toplu (batched) tahmin/güncelleme.
+# Çıktı: her taramada nesne ID'si, merkez ve hız.
+
+import math
+import time
+
+import numpy as np
+
+# ---- Config ----
+SEG_BASE_GAP = 0.10          # segment kırılma eşiği taban değeri (m)
+SEG_RANGE_FACTOR = 3.0       # eşik += faktör * r * açı adımı (uzak noktalar seyrek olduğu için)
+SEG_MIN_POINTS = 3           # bundan az noktalı segmentler gürültü sayılır
+TRACK_GATE = 0.8             # eşleştirme kapısı (m)
+TRACK_MIN_HITS = 3           # iz bu kadar eşleşmeden sonra onaylı sayılır
+TRACK_MAX_MISSES = 5         # bu kadar ardışık kaçırmada iz silinir
+KF_ACCEL_NOISE = 2.0         # süreç gürültüsü (m/s^2)
+KF_MEAS_NOISE = 0.05         # ölçüm gürültüsü (m)
+# -----------------
+
+
+def segment_scan(angles_rad, ranges_m, base_gap=SEG_BASE_GAP, range_factor=SEG_RANGE_FACTOR,
+                 min_points=SEG_MIN_POINTS):
+    """
+    Breakpoint segmentasyonu. Dönen değer: (centroids (K,2), sizes (K,), labels (N,))
+    labels geçersiz/küçük segment noktaları için -1'dir; sıra girdi sırasıyla aynıdır.
+    """
+    angles = np.asarray(angles_rad, dtype=np.float64)
+    ranges = np.asarray(ranges_m, dtype=np.float64)
+    n_in = angles.shape[0]
+    labels = np.full(n_in, -1, dtype=np.int64)
+    valid = np.flatnonzero(np.isfinite(ranges) & (ranges > 0))
+    if valid.shape[0] < min_points:
+        return np.zeros((0, 2)), np.zeros(0, dtype=np.int64), labels
+
+    order = valid[np.argsort(angles[valid] % (2 * math.pi), kind="stable")]
+    a = angles[order] % (2 * math.pi)
+    r = ranges[order]
+    x = r * np.cos(a)
+    y = r * np.sin(a)
+    n = order.shape[0]
+
+    # ardışık noktalar arası mesafe (son -> ilk: 360° sarmalı)
+    dx = np.roll(x, -1) - x
+    dy = np.roll(y, -1) - y
+    gap = np.hypot(dx, dy)
+    dtheta = (np.roll(a, -1) - a) % (2 * math.pi)
+    thr = base_gap + range_factor * np.minimum(r, np.roll(r, -1)) * dtheta
+    brk = gap > thr                               # brk[i]: i ile i+1 arasında kırılma
+
+    if not brk.any():
+        seg = np.zeros(n, dtype=np.int64)
+    else:
+        # ilk kırılmadan sonra başlayacak şekilde döndür: sarmal segment bölünmez
+        shift = int(np.flatnonzero(brk)[-1]) + 1
+        brk_r = np.roll(brk, -shift)
+        seg_r = np.concatenate(([0], np.cumsum(brk_r[:-1])))
+        seg = np.roll(seg_r, shift)
+
+    n_seg = int(seg.max()) + 1
+    sizes = np.bincount(seg, minlength=n_seg)
+    cx = np.bincount(seg, weights=x, minlength=n_seg) / sizes
+    cy = np.bincount(seg, weights=y, minlength=n_seg) / sizes
+    keep = sizes >= min_points
+    remap = np.full(n_seg, -1, dtype=np.int64)
+    remap[keep] = np.arange(int(keep.sum()))
+    labels[order] = remap[seg]
+    return np.c_[cx[keep], cy[keep]], sizes[keep], labels
+
+
+class MultiObjectTracker:
+    """
+    Sabit hız modelli Kalman filtreli çoklu nesne takipçisi.
+    Durum: [x, y, vx, vy]; tüm izler (N,4) / (N,4,4) dizilerinde toplu tutulur.
+    """
+
+    def __init__(self, gate=TRACK_GATE, min_hits=TRACK_MIN_HITS, max_misses=TRACK_MAX_MISSES,
+                 accel_noise=KF_ACCEL_NOISE, meas_noise=KF_MEAS_NOISE):
+        self.gate = gate
+        self.min_hits = min_hits
+        self.max_misses = max_misses
+        self.q = accel_noise ** 2
+        self.R = np.eye(2) * meas_noise ** 2
+        self.x = np.zeros((0, 4))
+        self.P = np.zeros((0, 4, 4))
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.misses = np.zeros(0, dtype=np.int64)
+        self.next_id = 1
+        self.last_t = None
+
+    def _predict(self, dt):
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+        # beyaz ivme gürültüsü modeli
+        dt2, dt3, dt4 = dt * dt, dt ** 3 / 2, dt ** 4 / 4
+        Q = self.q * np.array([[dt4, 0, dt3, 0], [0, dt4, 0, dt3], [dt3, 0, dt2, 0], [0, dt3, 0, dt2]])
+        self.x = self.x @ F.T
+        self.P = F @ self.P @ F.T + Q
+
+    def _associate(self, detections):
+        """Kapı içindeki en yakın çiftleri açgözlü eşleştirir. (track_idx, det_idx) dizileri döner."""
+        if self.x.shape[0] == 0 or detections.shape[0] == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        d = np.hypot(self.x[:, None, 0] - detections[None, :, 0], self.x[:, None, 1] - detections[None, :, 1])
+        cand = np.argwhere(d <= self.gate)
+        if cand.shape[0] == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        cand = cand[np.argsort(d[cand[:, 0], cand[:, 1]], kind="stable")]
+        used_t = np.zeros(self.x.shape[0], dtype=bool)
+        used_d = np.zeros(detections.shape[0], dtype=bool)
+        ti, di = [], []
+        for t, k in cand:
+            if not used_t[t] and not used_d[k]:
+                used_t[t] = used_d[k] = True
+                ti.append(t)
+                di.append(k)
+        return np.asarray(ti, dtype=np.int64), np.asarray(di, dtype=np.int64)
+
+    def update(self, detections, t):
+        """detections: (K,2) merkezler, t: tarama zamanı (s). Onaylı izleri döner."""
+        detections = np.asarray(detections, dtype=np.float64).reshape(-1, 2)
+        dt = 0.1 if self.last_t is None else max(1e-3, t - self.last_t)
+        self.last_t = t
+        if self.x.shape[0]:
+            self._predict(dt)
+
+        ti, di = self._associate(detections)
+        if ti.shape[0]:
+            # toplu Kalman güncellemesi (H = [I 0])
+            P = self.P[ti]
+            S = P[:, :2, :2] + self.R
+            K = P[:, :, :2] @ np.linalg.inv(S)
+            innov = detections[di] - self.x[ti, :2]
+            self.x[ti] += np.einsum("nij,nj->ni", K, innov)
+            self.P[ti] = P - K @ P[:, :2, :]
+            self.hits[ti] += 1
+            self.misses[ti] = 0
+
+        missed = np.ones(self.x.shape[0], dtype=bool)
+        missed[ti] = False
+        self.misses[missed] += 1
+        alive = self.misses <= self.max_misses
+        self.x, self.P = self.x[alive], self.P[alive]
+        self.ids, self.hits, self.misses = self.ids[alive], self.hits[alive], self.misses[alive]
+
+        # eşleşmeyen tespitler için yeni izler
+        new = np.ones(detections.shape[0], dtype=bool)
+        new[di] = False
+        k = int(new.sum())
+        if k:
+            x0 = np.zeros((k, 4))
+            x0[:, :2] = detections[new]
+            P0 = np.tile(np.diag([KF_MEAS_NOISE ** 2, KF_MEAS_NOISE ** 2, 1.0, 1.0]), (k, 1, 1))
+            self.x = np.concatenate((self.x, x0))
+            self.P = np.concatenate((self.P, P0))
+            self.ids = np.concatenate((self.ids, np.arange(self.next_id, self.next_id + k)))
+            self.hits = np.concatenate((self.hits, np.ones(k, dtype=np.int64)))
+            self.misses = np.concatenate((self.misses, np.zeros(k, dtype=np.int64)))
+            self.next_id += k
+
+        confirmed = (self.hits >= self.min_hits) & (self.misses == 0)
+        return [
+            {"id": int(i), "x": float(s[0]), "y": float(s[1]), "vx": float(s[2]), "vy": float(s[3])}
+            for i, s in zip(self.ids[confirmed], self.x[confirmed])
+        ]
+
+
+class ScanTracker:
+    """
+    Segmentasyon + takip boru hattı; aşama sürelerini self.timings'e (ms) ve varsa
+    lidar_metrics.Metrics örneğine yazar.
+    """
+
+    def __init__(self, metrics=None, **tracker_kwargs):
+        self.tracker = MultiObjectTracker(**tracker_kwargs)
+        self.metrics = metrics
+        self.timings = {}
+
+    def process(self, angles_rad, ranges_m, t=None):
+        t = time.monotonic() if t is None else t
+        t0 = time.perf_counter_ns()
+        centroids, sizes, labels = segment_scan(angles_rad, ranges_m)
+        t1 = time.perf_counter_ns()
+        objects = self.tracker.update(centroids, t)
+        t2 = time.perf_counter_ns()
+        self.timings = {"segment_ms": (t1 - t0) / 1e6, "track_ms": (t2 - t1) / 1e6}
+        if self.metrics is not None:
+            self.metrics.record_stage("segment", t0, t1)
+            self.metrics.record_stage("track", t1, t2)
+            self.metrics.set_gauge("tracked_objects", len(objects))
+        return objects
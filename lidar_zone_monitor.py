@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# lidar_zone_monitor.py
+# Düşük gecikmeli engel bölgesi izleyicisi (güvenlik sensörü kullanımı).
+# Bölgeler (sektör ya da çokgen) başlangıçta açı -> [yakın, uzak] mesafe tablolarına çevrilir;
+# her devir tek vektörel min-mesafe indirgemesiyle değerlendirilir, histerezisli geri çağrılar tetiklenir.
+# Edinim döngüsünde, CSV kaydı ve çizimden ÖNCE çağrılmak üzere tasarlanmıştır.
+
+import math
+import time
+
+import numpy as np
+
+# ---- Config ----
+ZONE_ANGLE_BINS = 1440       # tablo çözünürlüğü (0.25°)
+ZONE_MIN_POINTS = 3          # bir bölmede tek gürültü noktası alarm üretmesin
+ZONE_ON_COUNT = 1            # alarm için ardışık dolu devir sayısı
+ZONE_OFF_COUNT = 3           # alarmı kaldırmak için ardışık boş devir sayısı
+# -----------------
+
+
+def sector_zone(name, start_deg, end_deg, max_range_m, min_range_m=0.0):
+    """start_deg -> end_deg (saat yönünün tersi, sarmal olabilir) arasında max_range_m içi."""
+    return {"name": name, "type": "sector", "start_deg": start_deg, "end_deg": end_deg,
+            "min_range": min_range_m, "max_range": max_range_m}
+
+
+def polygon_zone(name, vertices_xy):
+    """Sensör koordinatlarında (m) çokgen bölge. Sensöre göre yıldız biçimli çokgenlerde tam doğrudur."""
+    return {"name": name, "type": "polygon", "vertices": [tuple(v) for v in vertices_xy]}
+
+
+def _ray_polygon_interval(theta, vertices):
+    """Her açı için ışının çokgenle kesiştiği [yakın, uzak] mesafeleri (kesişme yoksa inf, -inf)."""
+    v = np.asarray(vertices, dtype=np.float64)
+    p = v
+    q = np.roll(v, -1, axis=0)
+    dx = np.cos(theta)[:, None]
+    dy = np.sin(theta)[:, None]
+    ex = (q[:, 0] - p[:, 0])[None, :]
+    ey = (q[:, 1] - p[:, 1])[None, :]
+    denom = dx * ey - dy * ex
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (p[:, 0][None, :] * ey - p[:, 1][None, :] * ex) / denom       # ışın boyunca mesafe
+        u = (p[:, 0][None, :] * dy - p[:, 1][None, :] * dx) / denom       # kenar parametresi
+    hit = (np.abs(denom) > 1e-12) & (t >= 0) & (u >= 0) & (u <= 1)
+    near = np.where(hit, t, np.inf).min(axis=1)
+    far = np.where(hit, t, -np.inf).max(axis=1)
+    if _point_in_polygon(0.0, 0.0, v):
+        near = np.where(np.isfinite(far), 0.0, near)
+    return near, far
+
+
+def _point_in_polygon(x, y, v):
+    inside = False
+    n = len(v)
+    for i in range(n):
+        x1, y1 = v[i]
+        x2, y2 = v[(i + 1) % n]
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+    return inside
+
+
+class ZoneMonitor:
+    """
+        monitor = ZoneMonitor([sector_zone("ön", -30, 30, 0.8)], on_enter=alarm, on_exit=clear)
+        monitor.evaluate(angles_rad, ranges_m, t_arrival=time.perf_counter())
+
+    on_enter(zone_name, min_range_m, latency_s) / on_exit(zone_name, latency_s)
+    """
+
+    def __init__(self, zones, on_enter=None, on_exit=None, n_bins=ZONE_ANGLE_BINS,
+                 min_points=ZONE_MIN_POINTS, on_count=ZONE_ON_COUNT, off_count=ZONE_OFF_COUNT,
+                 metrics=None):
+        self.zones = list(zones)
+        self.names = [z["name"] for z in self.zones]
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.n_bins = n_bins
+        self.min_points = min_points
+        self.on_count = on_count
+        self.off_count = off_count
+        self.metrics = metrics
+        self._bin_scale = n_bins / (2 * math.pi)
+        self.near, self.far = self._build_tables()
+
+        nz = len(self.zones)
+        self.active = np.zeros(nz, dtype=bool)
+        self._hit_streak = np.zeros(nz, dtype=np.int64)
+        self._miss_streak = np.zeros(nz, dtype=np.int64)
+        self.min_range = np.full(nz, np.inf)
+        self.last_latency = 0.0
+
+    def _build_tables(self):
+        """(Z, B) boyutlu yakın/uzak mesafe tabloları; bölge dışı açılarda near=inf, far=-inf."""
+        theta = (np.arange(self.n_bins) + 0.5) / self._bin_scale
+        near = np.full((len(self.zones), self.n_bins), np.inf)
+        far = np.full((len(self.zones), self.n_bins), -np.inf)
+        deg = np.degrees(theta)
+        for i, z in enumerate(self.zones):
+            if z["type"] == "sector":
+                s = z["start_deg"] % 360.0
+                e = z["end_deg"] % 360.0
+                span = (e - s) % 360.0 or 360.0
+                inside = ((deg - s) % 360.0) <= span
+                near[i, inside] = z["min_range"]
+                far[i, inside] = z["max_range"]
+            elif z["type"] == "polygon":
+                near[i], far[i] = _ray_polygon_interval(theta, z["vertices"])
+            else:
+                raise ValueError(f"Bilinmeyen bölge tipi: {z['type']}")
+        return near, far
+
+    def evaluate(self, angles_rad, ranges_m, t_arrival=None):
+        """Bir devri değerlendirir; aktif bölge adlarının listesini döner."""
+        t_arrival = time.perf_counter() if t_arrival is None else t_arrival
+        r = np.asarray(ranges_m, dtype=np.float64)
+        b = np.floor((np.asarray(angles_rad, dtype=np.float64) % (2 * math.pi)) * self._bin_scale).astype(np.int64)
+        np.minimum(b, self.n_bins - 1, out=b)
+        valid = np.isfinite(r) & (r > 0)
+        r = np.where(valid, r, np.inf)
+
+        # (Z, N): tablo bakımı + tek seferde indirgeme
+        inside = (r[None, :] >= self.near[:, b]) & (r[None, :] <= self.far[:, b])
+        counts = inside.sum(axis=1)
+        self.min_range = np.where(inside, r[None, :], np.inf).min(axis=1) if r.shape[0] else np.full(len(self.zones), np.inf)
+        occupied = counts >= self.min_points
+
+        self._hit_streak = np.where(occupied, self._hit_streak + 1, 0)
+        self._miss_streak = np.where(occupied, 0, self._miss_streak + 1)
+        entered = ~self.active & (self._hit_streak >= self.on_count)
+        exited = self.active & (self._miss_streak >= self.off_count)
+        self.active = (self.active | entered) & ~exited
+
+        self.last_latency = time.perf_counter() - t_arrival
+        if self.metrics is not None:
+            self.metrics.observe("zone_latency_seconds", self.last_latency,
+                                 (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05))
+        for i in np.flatnonzero(entered):
+            if self.metrics is not None:
+                self.metrics.inc("zone_alarms")
+            if self.on_enter:
+                self.on_enter(self.names[i], float(self.min_range[i]), self.last_latency)
+        for i in np.flatnonzero(exited):
+            if self.on_exit:
+                self.on_exit(self.names[i], self.last_latency)
+        return [self.names[i] for i in np.flatnonzero(self.active)]
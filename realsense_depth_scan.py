@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# realsense_depth_scan.py
+# RealSense derinlik görüntüsünden sanal 2D lazer taraması (depthimage_to_laserscan).
+# 640x480 z16 karede seçilen satır bandında sütun başına en yakın mesafe alınır.
+# Sütun açıları ve ışın düzeltme çarpanları başlangıçta bir kez hesaplanır; kare başına iş
+# tek bir uint16 min-indirgemesi ve bir çarpmadır. Çıktı LIDAR yolu ile aynı: (açı rad, mesafe m).
+#
+# Kullanım (benchmark):
+#   python realsense_depth_scan.py --bench
+
+import sys
+import time
+
+import numpy as np
+
+# ---- Config ----
+DEPTH_WIDTH = 640
+DEPTH_HEIGHT = 480
+DEPTH_SCALE = 0.001          # z16 birimi -> metre (D4xx varsayılanı)
+DEFAULT_FX = 385.0           # intrinsics alınamazsa kullanılır (D435 640x480 civarı)
+DEFAULT_PPX = 320.0
+SCAN_BAND_CENTER = None      # None => görüntünün ortası (optik eksen)
+SCAN_BAND_HEIGHT = 10        # bant yüksekliği (satır)
+SCAN_RANGE_MIN = 0.2         # m
+SCAN_RANGE_MAX = 8.0         # m
+# -----------------
+
+
+class DepthToLaserScan:
+    """
+        conv = DepthToLaserScan.from_profile(profile)   # ya da DepthToLaserScan(fx=..., ppx=...)
+        angles, ranges = conv.convert(depth_image)       # depth_image: (H, W) uint16
+
+    Açılar LIDAR ile aynı yönde (soldan sağa azalan, kamera ekseni = 0 rad). Dönüşü olmayan
+    sütunların mesafesi 0'dır (LIDAR'daki sıfır dönüş gibi).
+    """
+
+    def __init__(self, width=DEPTH_WIDTH, height=DEPTH_HEIGHT, fx=DEFAULT_FX, ppx=DEFAULT_PPX,
+                 depth_scale=DEPTH_SCALE, band_center=SCAN_BAND_CENTER, band_height=SCAN_BAND_HEIGHT,
+                 range_min=SCAN_RANGE_MIN, range_max=SCAN_RANGE_MAX):
+        self.width = width
+        self.height = height
+        center = height // 2 if band_center is None else int(band_center)
+        self.row0 = max(0, center - band_height // 2)
+        self.row1 = min(height, self.row0 + max(1, band_height))
+
+        # sütun başına açı ve z -> ışın mesafesi çarpanı (sqrt(1 + ((u - cx)/fx)^2))
+        u = np.arange(width, dtype=np.float64) + 0.5
+        xn = (u - ppx) / fx
+        self.angles = (-np.arctan(xn)).astype(np.float64)
+        self._factor = (np.sqrt(1.0 + xn * xn) * depth_scale).astype(np.float32)
+        self.range_min = range_min
+        self.range_max = range_max
+        self._one = np.uint16(1)
+        self._ranges = np.zeros(width, dtype=np.float32)
+
+    @classmethod
+    def from_profile(cls, profile, **kwargs):
+        """pyrealsense2 pipeline profilinden intrinsics ve derinlik ölçeğini okur."""
+        import pyrealsense2 as rs
+
+        stream = profile.get_stream(rs.stream.depth).as_video_stream_profile()
+        intr = stream.get_intrinsics()
+        scale = profile.get_device().first_depth_sensor().get_depth_scale()
+        return cls(width=intr.width, height=intr.height, fx=intr.fx, ppx=intr.ppx, depth_scale=scale, **kwargs)
+
+    def convert(self, depth_image):
+        """(açılar rad, mesafeler m) döner. Dönen mesafe dizisi bir sonraki çağrıda üzerine yazılır."""
+        band = depth_image[self.row0:self.row1]
+        # 0 (geçersiz) değerleri en büyüğe sarmak için 1 çıkar: uint16 taşması bilinçli
+        nearest = (band - self._one).min(axis=0)
+        nearest += self._one
+        r = np.multiply(nearest, self._factor, out=self._ranges)
+        # nearest == 0 => bantta hiç geçerli piksel yok, aralık dışı => dönüş yok
+        r[(r < self.range_min) | (r > self.range_max)] = 0.0
+        return self.angles, self._ranges
+
+
+def benchmark(frames=300):
+    conv = DepthToLaserScan()
+    rng = np.random.default_rng(0)
+    depth = rng.integers(0, 6000, size=(DEPTH_HEIGHT, DEPTH_WIDTH), dtype=np.uint16)
+    depth[rng.random(depth.shape) < 0.1] = 0
+    conv.convert(depth)
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        conv.convert(depth)
+    per_frame = (time.perf_counter() - t0) / frames
+    print(f"⏱️ {DEPTH_WIDTH}x{DEPTH_HEIGHT}, bant {conv.row1 - conv.row0} satır: {per_frame * 1000:.3f} ms/kare")
+    return per_frame
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        print("Kullanım: python realsense_depth_scan.py --bench")
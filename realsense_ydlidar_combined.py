@@ -1,9 +1,18 @@
 import sys
 import glob
+import threading
 import time
+import numpy as np
 import pyrealsense2 as rs
 from ydlidar import CYdLidar, LaserScan
 
+from lidar_metrics import Metrics
+from realsense_depth_scan import DepthToLaserScan
+
+# aşama süreleri / sayaçlar (log satırı + http://127.0.0.1:9108/metrics + trace)
+metrics = Metrics()
+metrics.serve_http()
+
 # -------------------------------
 # 1️⃣ LIDAR Port Bulma
 # -------------------------------
@@ -46,7 +55,9 @@ config.enable_stream(rs.stream.color, 640, 480, rs.format.bgr8, 30)
 config.enable_stream(rs.stream.depth, 640, 480, rs.format.z16, 30)
 
 try:
-    pipeline.start(config)
+    profile = pipeline.start(config)
+    # derinlik karesini LIDAR ile aynı (açı, mesafe) biçiminde sanal taramaya çevir
+    depth_scan = DepthToLaserScan.from_profile(profile)
     print("✅ RealSense başlatıldı.")
     time.sleep(2)  # 🔹 Kameranın sensörleri ısınsın
 except Exception as e:
@@ -54,36 +65,70 @@ except Exception as e:
     sys.exit(1)
 
 # -------------------------------
-# 4️⃣ Tarama ve Görüntü Döngüsü
+# 4️⃣ RealSense Döngüsü (ayrı thread, kamera hızında: 30 FPS)
+# -------------------------------
+# LIDAR döngüsü her devirde ~100 ms bekler; derinlik dönüşümü aynı döngüde kalsaydı
+# karelerin çoğu hiç çevrilmezdi. wait_for_frames GIL'i bırakır, dönüşüm ~0.02 ms sürer.
+stop_event = threading.Event()
+latest_cam_scan = None          # (zaman, açılar, mesafeler) — en son sanal tarama
+
+
+def realsense_loop():
+    global latest_cam_scan
+    last_print = 0.0
+    while not stop_event.is_set():
+        try:
+            with metrics.timer("realsense_acquire"):
+                frames = pipeline.wait_for_frames(timeout_ms=1000)  # 🔹 1 saniye bekle
+                color_frame = frames.get_color_frame()
+                depth_frame = frames.get_depth_frame()
+        except RuntimeError:
+            metrics.inc("realsense_timeouts")
+            print("⚠️ RealSense veri gelmedi, tekrar deniyor...")
+            continue
+        if not (color_frame and depth_frame):
+            continue
+        metrics.inc("realsense_frames")
+        with metrics.timer("depth_to_scan"):
+            cam_angles, cam_ranges = depth_scan.convert(np.asanyarray(depth_frame.get_data()))
+        # convert aynı mesafe tamponunu tekrar kullanır: paylaşılan sonuç kopyalanır
+        latest_cam_scan = (time.time(), cam_angles, cam_ranges.copy())
+        now = time.monotonic()
+        if now - last_print >= 1.0:
+            last_print = now
+            print(f"📷 RealSense sanal tarama: {int((cam_ranges > 0).sum())} nokta.")
+
+
+camera_thread = threading.Thread(target=realsense_loop, name="realsense", daemon=True)
+camera_thread.start()
+
+# -------------------------------
+# 5️⃣ LIDAR Tarama Döngüsü (doProcessSimple devir başına bloklar)
 # -------------------------------
 try:
     while True:
-        # --- LIDAR ---
         scan = LaserScan()
-        if lidar.doProcessSimple(scan):
+        with metrics.timer("lidar_acquire"):
+            ok = lidar.doProcessSimple(scan)
+        if ok:
+            n_zero = sum(1 for p in scan.points if p.range == 0)
+            metrics.record_scan(len(scan.points), n_zero)
             print(f"{len(scan.points)} nokta alındı.")
             for p in scan.points[:5]:  # sadece ilk 5 noktayı örnek yazdır
                 print(f"Açı: {p.angle:.2f}, Mesafe: {p.range:.2f}")
+        else:
+            time.sleep(0.01)
 
-        # --- RealSense ---
-        try:
-            frames = pipeline.wait_for_frames(timeout_ms=1000)  # 🔹 1 saniye bekle
-            color_frame = frames.get_color_frame()
-            depth_frame = frames.get_depth_frame()
-            if color_frame and depth_frame:
-                print("📷 RealSense kareleri alındı.")
-        except RuntimeError:
-            print("⚠️ RealSense veri gelmedi, tekrar deniyor...")
-            continuey
-
-        time.sleep(0.1)
+        metrics.maybe_log()
 
 except KeyboardInterrupt:
     print("\n🛑 Program durduruldu.")
 finally:
+    stop_event.set()
+    camera_thread.join(timeout=2.0)
     lidar.turnOff()
     pipeline.stop()
-
-
-
-
+    metrics.close()
+    print(f"📈 {metrics.summary_line()}")
+    trace_file = metrics.dump_chrome_trace(f"realsense_lidar_trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    print(f"🧭 Trace kaydedildi: {trace_file}")
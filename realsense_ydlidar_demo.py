@@ -1,6 +1,8 @@
 import time
 from ydlidar import CYdLidar
 
+from lidar_metrics import Metrics
+
 def main():
     # LIDAR objesi oluştur
     lidar = CYdLidar()
@@ -16,20 +18,29 @@ def main():
         return
 
     print("LIDAR başlatıldı. Tarama başlıyor...")
+    metrics = Metrics()
+    metrics.serve_http()
     try:
         while True:
-            scan = lidar.doProcessSimple()
+            with metrics.timer("acquire"):
+                scan = lidar.doProcessSimple()
             if scan:
-                for point in scan:
-                    print(f"Açı: {point.angle:.2f}°, Mesafe: {point.range:.2f}m")
+                metrics.record_scan(len(scan), sum(1 for p in scan if p.range == 0))
+                with metrics.timer("print"):
+                    for point in scan:
+                        print(f"Açı: {point.angle:.2f}°, Mesafe: {point.range:.2f}m")
             else:
+                metrics.inc("empty_reads")
                 print("Tarama verisi yok.")
+            metrics.maybe_log()
             time.sleep(0.1)  # Çok hızlı dönmemesi için küçük gecikme
     except KeyboardInterrupt:
         print("\nTarama durduruldu. LIDAR kapatılıyor...")
     finally:
         lidar.turnOff()
         lidar.disconnect()
+        metrics.close()
+        print(f"📈 {metrics.summary_line()}")
         print("LIDAR bağlantısı kapatıldı.")
 
 if __name__ == "__main__":